@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+audio_frames.py
+
+Microphone capture at the device's native rate / channel count with a
+recycled frame pool and a vectorized polyphase downmix + resample to the
+16 kHz mono float32 that Whisper expects.
+
+  FramePool          preallocated blocks handed from the audio callback to
+                     the consumer and released back after use (no per-block
+                     allocation in the callback). If the consumer holds every
+                     frame, new blocks are dropped: a slow consumer loses
+                     audio instead of falling behind; read() reports drops
+  DownmixResampler   channel downmix and polyphase FIR resampling in one
+                     pass into preallocated buffers
+  NativeCapture      sounddevice InputStream wired to the two above
+
+Usage:
+  python3 audio_frames.py --bench      # allocations / CPU per second of audio
+"""
+
+import time
+import queue
+import argparse
+import tracemalloc
+from math import gcd, ceil
+import numpy as np
+
+TARGET_RATE = 16000
+MAX_CAPTURE_CHANNELS = 2    # downmix at most a stereo pair
+POOL_SIZE = 8
+DROP_REPORT_INTERVAL = 5.0  # seconds between "dropped audio" warnings
+
+# ----------------------------------------------------------------------
+# Frame pool
+# ----------------------------------------------------------------------
+
+class FramePool:
+    def __init__(self, n_frames, blocksize, channels, dtype=np.float32):
+        self.free = queue.SimpleQueue()
+        for _ in range(n_frames):
+            self.free.put(np.zeros((blocksize, channels), dtype=dtype))
+        self.dropped = 0
+
+    def acquire(self):
+        """Get a free frame, or None if the consumer is holding all of them."""
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+
+    def release(self, frame):
+        self.free.put(frame)
+
+# ----------------------------------------------------------------------
+# Polyphase downmix + resample
+# ----------------------------------------------------------------------
+
+def design_lowpass(up, down, half_taps=16, rolloff=0.95, beta=8.0):
+    """Kaiser-windowed sinc anti-aliasing filter at the upsampled rate."""
+    if up == down:
+        return np.ones(1)
+    f = max(up, down)
+    n = 2 * half_taps * f + 1
+    t = np.arange(n) - (n - 1) / 2
+    h = rolloff / f * np.sinc(rolloff * t / f) * np.kaiser(n, beta)
+    return h * up
+
+def blocksize_for(in_rate, duration, out_rate=TARGET_RATE):
+    """Native blocksize closest to `duration` that resamples to whole samples."""
+    down = in_rate // gcd(in_rate, out_rate)
+    return max(1, round(in_rate * duration / down)) * down
+
+class DownmixResampler:
+    """
+    Converts fixed-size (blocksize, channels) float32 blocks at `in_rate`
+    to mono float32 at `out_rate`. Filter history is carried across blocks,
+    so consecutive blocks form one continuous signal.
+
+    process() returns a view of an internal buffer that is overwritten by
+    the next call. At the output rate there is nothing to filter, so the
+    block is only downmixed (copied for mono).
+    """
+
+    def __init__(self, in_rate, channels, blocksize, out_rate=TARGET_RATE):
+        g = gcd(in_rate, out_rate)
+        up, down = out_rate // g, in_rate // g
+        if blocksize % down:
+            raise ValueError(f"blocksize must be a multiple of {down} for {in_rate} Hz input")
+
+        h = design_lowpass(up, down)
+        n_taps = ceil(len(h) / up)
+        h = np.concatenate([h, np.zeros(n_taps * up - len(h))])
+
+        # y[m] = sum_k h[p_m + k*up] * x[base_m - k]; the phase pattern
+        # repeats every block because blocksize is a multiple of `down`.
+        n_out = blocksize * up // down
+        m = np.arange(n_out)
+        phase = (m * down) % up
+        base = (m * down) // up
+        k = np.arange(n_taps)
+
+        self.channels = channels
+        self.passthrough = up == down
+        self.history = n_taps - 1
+        self.taps = (h.reshape(n_taps, up).T[phase] / channels).astype(np.float32)
+        self.index = self.history + base[:, None] - k[None, :]
+        self.mono = np.zeros(self.history + blocksize, dtype=np.float32)
+        self.gather = np.empty((n_out, n_taps), dtype=np.float32)
+        self.out = np.empty(n_out, dtype=np.float32)
+
+    def process(self, block):
+        if self.passthrough:
+            if self.channels == 1:
+                np.copyto(self.out, block[:, 0])
+            else:
+                np.sum(block, axis=1, out=self.out)
+                self.out *= 1 / self.channels
+            return self.out
+
+        h = self.history
+        # downmix straight into the filter input (1/channels is in the taps)
+        np.sum(block, axis=1, out=self.mono[h:])
+        np.take(self.mono, self.index, out=self.gather, mode="clip")
+        np.einsum("nk,nk->n", self.taps, self.gather, out=self.out)
+        if h:
+            self.mono[:h] = self.mono[-h:]
+        return self.out
+
+# ----------------------------------------------------------------------
+# Native-rate capture
+# ----------------------------------------------------------------------
+
+def native_input_format(device=None):
+    import sounddevice as sd
+
+    info = sd.query_devices(device, "input")
+    rate = int(info["default_samplerate"])
+    channels = max(1, min(int(info["max_input_channels"]), MAX_CAPTURE_CHANNELS))
+    return rate, channels
+
+class NativeCapture:
+    def __init__(self, chunk_duration, device=None, pool_size=POOL_SIZE):
+        self.device = device
+        self.rate, self.channels = native_input_format(device)
+        self.blocksize = blocksize_for(self.rate, chunk_duration)
+        self.pool = FramePool(pool_size, self.blocksize, self.channels)
+        self.resampler = DownmixResampler(self.rate, self.channels, self.blocksize)
+        self.q = queue.Queue()
+        self.reported_drops = 0
+        self.last_report = float("-inf")
+
+    def audio_callback(self, indata, frames, time_info, status):
+        if status:
+            print("Audio Warning:", status)
+        frame = self.pool.acquire()
+        if frame is None:
+            return      # consumer is behind; drop this block
+        np.copyto(frame, indata)
+        self.q.put(frame)
+
+    def start(self):
+        import sounddevice as sd
+
+        print(f"🎙 Capturing at {self.rate} Hz, {self.channels} ch → {TARGET_RATE} Hz mono")
+        self.stream = sd.InputStream(
+            device=self.device,
+            channels=self.channels,
+            samplerate=self.rate,
+            callback=self.audio_callback,
+            blocksize=self.blocksize,
+            dtype=np.float32
+        )
+        self.stream.start()
+
+    def read(self):
+        """Next block as 16 kHz mono float32 (valid until the next read)."""
+        frame = self.q.get()
+        self.report_drops()
+        try:
+            return self.resampler.process(frame)
+        finally:
+            self.pool.release(frame)
+
+    def report_drops(self, force=False):
+        """Warn about blocks dropped since the last warning (rate-limited)."""
+        dropped = self.pool.dropped - self.reported_drops
+        now = time.monotonic()
+        if not dropped or (not force and now - self.last_report < DROP_REPORT_INTERVAL):
+            return
+        self.reported_drops += dropped
+        self.last_report = now
+        lost = dropped * self.blocksize / self.rate
+        print(f"Audio Warning: dropped {dropped} blocks ({lost:.1f}s of audio), "
+              f"consumer is slower than real time ({self.pool.dropped} total)")
+
+    def stop(self):
+        self.stream.stop()
+        self.stream.close()
+        self.report_drops(force=True)
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+def _legacy_path(indata):
+    # old scripts: 16 kHz mono capture, copy in callback, slice + astype
+    chunk = indata.copy()
+    return chunk[:, 0].astype(np.float32)
+
+def _naive_native_path(indata, in_rate):
+    # native capture done the straightforward way: copy, mean, interp
+    chunk = indata.copy()
+    mono = chunk.mean(axis=1)
+    n_out = len(mono) * TARGET_RATE // in_rate
+    x_out = np.arange(n_out) * (in_rate / TARGET_RATE)
+    return np.interp(x_out, np.arange(len(mono)), mono).astype(np.float32)
+
+def _measure(name, step, block, seconds_per_block, n_blocks):
+    step(block)     # warm up
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    step(block)
+    alloc = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    t0 = time.process_time()
+    for _ in range(n_blocks):
+        step(block)
+    cpu = (time.process_time() - t0) / (n_blocks * seconds_per_block)
+
+    per_sec = 1 / seconds_per_block
+    print(f"  {name:34s} {alloc * per_sec / 1024:10.1f} KiB allocated/s audio "
+          f"{1000 * cpu:8.3f} ms CPU/s audio")
+
+def bench(chunk_duration=0.6, n_blocks=200):
+    rng = np.random.default_rng(0)
+
+    print("\n16000 Hz, 1 ch (old fixed capture)")
+    bs = blocksize_for(16000, chunk_duration)
+    block = rng.standard_normal((bs, 1)).astype(np.float32)
+    _measure("copy + slice + astype (before)", _legacy_path, block, bs / 16000, n_blocks)
+
+    for rate, channels in ((48000, 2), (44100, 2), (16000, 1)):
+        bs = blocksize_for(rate, chunk_duration)
+        block = rng.standard_normal((bs, channels)).astype(np.float32)
+        pool = FramePool(POOL_SIZE, bs, channels)
+        rs = DownmixResampler(rate, channels, bs)
+
+        def pooled(indata):
+            frame = pool.acquire()
+            np.copyto(frame, indata)
+            out = rs.process(frame)
+            pool.release(frame)
+            return out
+
+        print(f"\n{rate} Hz, {channels} ch (native capture)")
+        _measure("copy + mean + interp (naive)", lambda b: _naive_native_path(b, rate),
+                 block, bs / rate, n_blocks)
+        _measure("frame pool + polyphase (after)", pooled, block, bs / rate, n_blocks)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true",
+                        help="Report allocations and CPU per second of audio")
+    parser.add_argument("--chunk_duration", type=float, default=0.6)
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.chunk_duration)
+    else:
+        parser.print_help()
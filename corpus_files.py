@@ -0,0 +1,33 @@
+"""
+corpus_files.py
+
+Layout of the split files written by merge_all.py and line readers for
+them, shared by the scripts that train on or evaluate with data/.
+
+  data/{split}.hi, data/{split}.te     target side
+  SRC_FILES[lang]                      English side aligned with it
+
+Importing this module has no side effects (merge_all.py creates data/ on
+import).
+"""
+
+# English side aligned with data/{split}.{lang}
+SRC_FILES = {"hi": "{split}.en", "te": "{split}.en-te.en"}
+
+
+def read_batches(path, max_lines=None, batch_size=1000):
+    batch, n = [], 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            batch.append(line.strip())
+            n += 1
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+            if max_lines and n >= max_lines:
+                break
+    if batch:
+        yield batch
+
+def read_lines(path, max_lines=None):
+    return [ln for batch in read_batches(path, max_lines) for ln in batch]
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+distill.py
+
+Sequence-level knowledge distillation: a small CPU-fast student
+translator trained on the teacher's own translations.
+
+Steps (per target language):
+  decode   teacher translates data/train.en in large batches into a
+           distilled corpus, written as shards; finished shards are
+           skipped, so an interrupted run resumes where it stopped and
+           shards can be split across workers. Each shard has a
+           shard-NNNNN.json sidecar recording the source line range it
+           covers, and a shard is only reused if that range matches
+  merge    check that the shards cover the source without gaps or
+           overlaps, then concatenate them into
+           distill/{lang}/train.en / train.{lang}
+  train    shallower student (default 6-layer encoder, 2-layer decoder)
+           initialised from teacher layers and trained on the distilled
+           corpus
+  report   teacher vs student latency, throughput and BLEU on the
+           validation split
+
+The student keeps the teacher's tokenizer, so it is a drop-in backend:
+  python3 incremental_translate.py --backend student
+
+Usage:
+  python3 distill.py decode --lang hi --teacher model_training/final_model
+  python3 distill.py decode --lang hi --worker 1 --num_workers 4
+  python3 distill.py merge --lang hi
+  python3 distill.py train --lang hi
+  python3 distill.py report --lang hi
+"""
+
+import os
+import json
+import time
+import argparse
+from glob import glob
+
+from marian_translate import MODELS, STUDENT_MODELS, MAX_LEN, NUM_BEAMS
+from corpus_files import SRC_FILES, read_lines
+
+DATA_DIR = "data"
+DISTILL_DIR = "distill"
+SHARD_LINES = 50000
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+def count_lines(path):
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+def shard_path(args, k, ext):
+    return os.path.join(args.distill_dir, args.lang, f"shard-{k:05d}.{ext}")
+
+def read_shard_info(args, k):
+    """Sidecar of a finished shard, or None if absent / files incomplete."""
+    try:
+        with open(shard_path(args, k, "json"), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        for ext in ("en", args.lang):
+            if count_lines(shard_path(args, k, ext)) != info["lines"]:
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return info
+
+def shard_done(args, k, start, lines):
+    info = read_shard_info(args, k)
+    return info is not None and info["start"] == start and info["lines"] == lines
+
+def translate_sorted(model, tokenizer, lines, batch_size, num_beams, device):
+    """Translate in length-sorted batches (less padding), original order kept."""
+    import torch
+
+    order = sorted(range(len(lines)), key=lambda i: len(lines[i]))
+    out = [None] * len(lines)
+    for b in range(0, len(order), batch_size):
+        idx = order[b:b + batch_size]
+        batch = tokenizer([lines[i] for i in idx], return_tensors="pt", padding=True,
+                          truncation=True, max_length=MAX_LEN).to(device)
+        with torch.no_grad():
+            gen = model.generate(**batch, max_length=MAX_LEN, num_beams=num_beams)
+        for i, text in zip(idx, tokenizer.batch_decode(gen, skip_special_tokens=True)):
+            out[i] = " ".join(text.split())
+    return out
+
+def load_model(name, device):
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+    tokenizer = AutoTokenizer.from_pretrained(name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(name).to(device).eval()
+    return model, tokenizer
+
+# ----------------------------------------------------------------------
+# Step 1: teacher decoding (sharded, resumable)
+# ----------------------------------------------------------------------
+
+def decode(args):
+    src_path = os.path.join(args.data_dir, "train.en")
+    n_lines = count_lines(src_path)
+    if args.max_lines:
+        n_lines = min(n_lines, args.max_lines)
+    n_shards = (n_lines + args.shard_lines - 1) // args.shard_lines
+    mine = [k for k in range(n_shards) if k % args.num_workers == args.worker]
+    todo = {k for k in mine
+            if not shard_done(args, k, k * args.shard_lines,
+                              min(args.shard_lines, n_lines - k * args.shard_lines))}
+    print(f"{src_path}: {n_lines} lines, {n_shards} shards, "
+          f"{len(mine) - len(todo)} of this worker's {len(mine)} already done")
+    if not todo:
+        return
+
+    model, tokenizer = load_model(args.teacher, args.device)
+    os.makedirs(os.path.join(args.distill_dir, args.lang), exist_ok=True)
+
+    with open(src_path, "r", encoding="utf-8") as f:
+        k, lines = 0, []
+        for n, line in enumerate(f):
+            if n >= n_lines:
+                break
+            lines.append(line.strip())
+            if len(lines) == args.shard_lines or n == n_lines - 1:
+                if k in todo:
+                    t0 = time.perf_counter()
+                    hyps = translate_sorted(model, tokenizer, lines, args.batch_size,
+                                            args.num_beams, args.device)
+                    # write to .tmp and rename; the sidecar goes last, so a
+                    # shard only counts as done once both files are complete
+                    info = {"source": src_path, "start": k * args.shard_lines,
+                            "lines": len(lines)}
+                    for ext, rows in (("en", lines), (args.lang, hyps)):
+                        tmp = shard_path(args, k, ext) + ".tmp"
+                        with open(tmp, "w", encoding="utf-8") as out:
+                            for row in rows:
+                                out.write(row + "\n")
+                    with open(shard_path(args, k, "json") + ".tmp", "w", encoding="utf-8") as out:
+                        json.dump(info, out)
+                    for ext in ("en", args.lang, "json"):
+                        os.replace(shard_path(args, k, ext) + ".tmp", shard_path(args, k, ext))
+                    dt = time.perf_counter() - t0
+                    print(f"  shard {k:05d}: {len(lines)} lines in {dt:.1f}s "
+                          f"({len(lines) / dt:.1f} sent/s)")
+                k, lines = k + 1, []
+
+# ----------------------------------------------------------------------
+# Step 2: merge shards
+# ----------------------------------------------------------------------
+
+def merge(args):
+    out_dir = os.path.join(args.distill_dir, args.lang)
+    paths = sorted(glob(os.path.join(out_dir, f"shard-*.{args.lang}")))
+    if not paths:
+        raise FileNotFoundError(f"No shards in {out_dir}")
+
+    shards = []
+    for p in paths:
+        k = int(os.path.basename(p)[len("shard-"):-len(args.lang) - 1])
+        info = read_shard_info(args, k)
+        if info is None:
+            raise ValueError(f"Shard {k:05d} in {out_dir} has no sidecar or a wrong "
+                             f"line count; re-run decode")
+        shards.append((info["start"], info["lines"], k))
+
+    # shards must tile the source from line 0 with no gaps or overlaps
+    shards.sort()
+    expected = 0
+    for start, lines, k in shards:
+        if start != expected:
+            raise ValueError(f"Shard {k:05d} starts at line {start}, expected {expected} "
+                             f"(gap or overlap, e.g. --shard_lines or --max_lines changed "
+                             f"between runs); remove stale shards and re-run decode")
+        expected += lines
+
+    n = 0
+    with open(os.path.join(out_dir, "train.en"), "w", encoding="utf-8") as fe, \
+         open(os.path.join(out_dir, f"train.{args.lang}"), "w", encoding="utf-8") as ft:
+        for _, _, k in shards:
+            with open(shard_path(args, k, "en"), "r", encoding="utf-8") as se, \
+                 open(shard_path(args, k, args.lang), "r", encoding="utf-8") as st:
+                for src, hyp in zip(se, st):
+                    if src.strip() and hyp.strip():
+                        fe.write(src)
+                        ft.write(hyp)
+                        n += 1
+    print(f"Merged {len(shards)} shards (source lines 0-{expected}): "
+          f"{n} distilled pairs in {out_dir}")
+
+# ----------------------------------------------------------------------
+# Step 3: student training
+# ----------------------------------------------------------------------
+
+def pick_layers(n_teacher, n_student):
+    """Evenly spaced teacher layers, always keeping the first and last."""
+    if n_student == 1:
+        return [n_teacher - 1]
+    return [round(i * (n_teacher - 1) / (n_student - 1)) for i in range(n_student)]
+
+def init_student(teacher, encoder_layers, decoder_layers):
+    from transformers import MarianMTModel
+
+    t_cfg = teacher.config
+    cfg = t_cfg.__class__.from_dict(t_cfg.to_dict())
+    cfg.encoder_layers = encoder_layers
+    cfg.decoder_layers = decoder_layers
+    student = MarianMTModel(cfg)
+
+    maps = {
+        "model.encoder.layers.": pick_layers(t_cfg.encoder_layers, encoder_layers),
+        "model.decoder.layers.": pick_layers(t_cfg.decoder_layers, decoder_layers),
+    }
+    t_state = teacher.state_dict()
+    state = {}
+    for key in student.state_dict():
+        src = key
+        for prefix, layers in maps.items():
+            if key.startswith(prefix):
+                j, rest = key[len(prefix):].split(".", 1)
+                src = f"{prefix}{layers[int(j)]}.{rest}"
+        state[key] = t_state[src]
+    student.load_state_dict(state)
+    print(f"Student: {encoder_layers} encoder layers {maps['model.encoder.layers.']}, "
+          f"{decoder_layers} decoder layers {maps['model.decoder.layers.']} from teacher")
+    return student
+
+def train(args):
+    from datasets import Dataset
+    from transformers import (Seq2SeqTrainingArguments, Seq2SeqTrainer,
+                              DataCollatorForSeq2Seq)
+
+    teacher, tokenizer = load_model(args.teacher, "cpu")
+    model = init_student(teacher, args.encoder_layers, args.decoder_layers)
+    del teacher
+
+    data = os.path.join(args.distill_dir, args.lang)
+    src = read_lines(os.path.join(data, "train.en"))
+    tgt = read_lines(os.path.join(data, f"train.{args.lang}"))
+    train_ds = Dataset.from_dict({"src": src, "tgt": tgt})
+    v_src = read_lines(os.path.join(args.data_dir,
+                                    SRC_FILES[args.lang].format(split="valid")), 2000)
+    v_tgt = read_lines(os.path.join(args.data_dir, f"valid.{args.lang}"), 2000)
+    n = min(len(v_src), len(v_tgt))
+    valid_ds = Dataset.from_dict({"src": v_src[:n], "tgt": v_tgt[:n]})
+    print("Distilled train examples:", len(train_ds))
+    print("Valid examples:", len(valid_ds))
+
+    def preprocess_batch(batch):
+        inputs = tokenizer(batch["src"], truncation=True, max_length=MAX_LEN)
+        labels = tokenizer(text_target=batch["tgt"], truncation=True, max_length=MAX_LEN)
+        inputs["labels"] = labels["input_ids"]
+        return inputs
+
+    train_ds = train_ds.map(preprocess_batch, batched=True, remove_columns=["src", "tgt"])
+    valid_ds = valid_ds.map(preprocess_batch, batched=True, remove_columns=["src", "tgt"])
+
+    out_dir = args.student or STUDENT_MODELS[args.lang]
+    training_args = Seq2SeqTrainingArguments(
+        output_dir=os.path.join(out_dir, "checkpoints"),
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        gradient_accumulation_steps=args.grad_accum,
+        num_train_epochs=args.epochs,
+        learning_rate=args.lr,
+        logging_steps=200,
+        save_total_limit=3,
+        report_to="none",
+    )
+    trainer = Seq2SeqTrainer(
+        model=model,
+        args=training_args,
+        train_dataset=train_ds,
+        eval_dataset=valid_ds,
+        tokenizer=tokenizer,
+        data_collator=DataCollatorForSeq2Seq(tokenizer, model=model),
+    )
+    trainer.train()
+    trainer.save_model(out_dir)
+    tokenizer.save_pretrained(out_dir)
+    print("Saved student model to", out_dir)
+
+# ----------------------------------------------------------------------
+# Step 4: side-by-side report
+# ----------------------------------------------------------------------
+
+def report(args):
+    import torch
+    import evaluate
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    src = read_lines(os.path.join(args.data_dir,
+                                  SRC_FILES[args.lang].format(split="valid")), args.max_lines)
+    refs = read_lines(os.path.join(args.data_dir, f"valid.{args.lang}"), args.max_lines)
+    n = min(len(src), len(refs))
+    src, refs = src[:n], refs[:n]
+    if not n:
+        raise ValueError(f"No validation pairs in {args.data_dir} for en->{args.lang}")
+    bleu = evaluate.load("sacrebleu")
+
+    print(f"\nen->{args.lang}, {n} validation sentences, beams {args.num_beams}")
+    for label, name in (("teacher", args.teacher),
+                        ("student", args.student or STUDENT_MODELS[args.lang])):
+        model, tokenizer = load_model(name, args.device)
+        params = sum(p.numel() for p in model.parameters()) / 1e6
+
+        # untimed warm-up, so the model run first does not absorb the
+        # process's one-time costs
+        translate_sorted(model, tokenizer, src[:args.batch_size], args.batch_size,
+                         args.num_beams, args.device)
+
+        # latency: one sentence at a time, as in the live pipeline
+        lat = []
+        for line in src[:args.latency_lines]:
+            t0 = time.perf_counter()
+            translate_sorted(model, tokenizer, [line], 1, args.num_beams, args.device)
+            lat.append(time.perf_counter() - t0)
+
+        # throughput + BLEU: batched over the whole split
+        t0 = time.perf_counter()
+        preds = translate_sorted(model, tokenizer, src, args.batch_size, args.num_beams,
+                                 args.device)
+        elapsed = time.perf_counter() - t0
+        score = bleu.compute(predictions=preds, references=[[r] for r in refs])["score"]
+
+        print(f"  {label:8s} {params:6.1f}M params  latency {1000 * sum(lat) / len(lat):7.1f} ms/sent  "
+              f"throughput {n / elapsed:7.2f} sent/s  BLEU {score:6.2f}")
+        del model
+
+# ----------------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("--lang", choices=sorted(MODELS), required=True)
+        p.add_argument("--teacher", type=str, default=None,
+                       help="Teacher model dir/name (default: opus-mt for --lang; "
+                            "use the fine-tuned model from Training.ipynb if available)")
+        p.add_argument("--data_dir", type=str, default=DATA_DIR)
+        p.add_argument("--distill_dir", type=str, default=DISTILL_DIR)
+        p.add_argument("--device", type=str, default="cpu")
+
+    p = sub.add_parser("decode", help="Teacher-decode train.en into distilled shards")
+    common(p)
+    p.add_argument("--batch_size", type=int, default=64)
+    p.add_argument("--num_beams", type=int, default=NUM_BEAMS)
+    p.add_argument("--shard_lines", type=int, default=SHARD_LINES)
+    p.add_argument("--max_lines", type=int, default=0, help="0 = whole file")
+    p.add_argument("--worker", type=int, default=0)
+    p.add_argument("--num_workers", type=int, default=1)
+    p.set_defaults(func=decode)
+
+    p = sub.add_parser("merge", help="Concatenate finished shards")
+    common(p)
+    p.set_defaults(func=merge)
+
+    p = sub.add_parser("train", help="Train the student on the distilled corpus")
+    common(p)
+    p.add_argument("--student", type=str, default=None,
+                   help="Output dir (default: STUDENT_MODELS in marian_translate.py)")
+    p.add_argument("--encoder_layers", type=int, default=6)
+    p.add_argument("--decoder_layers", type=int, default=2)
+    p.add_argument("--batch_size", type=int, default=32)
+    p.add_argument("--grad_accum", type=int, default=2)
+    p.add_argument("--epochs", type=int, default=3)
+    p.add_argument("--lr", type=float, default=3e-4)
+    p.set_defaults(func=train)
+
+    p = sub.add_parser("report", help="Teacher vs student latency / throughput / BLEU")
+    common(p)
+    p.add_argument("--student", type=str, default=None)
+    p.add_argument("--max_lines", type=int, default=1000)
+    p.add_argument("--latency_lines", type=int, default=100,
+                   help="Sentences timed one at a time (at least 1)")
+    p.add_argument("--batch_size", type=int, default=32)
+    p.add_argument("--num_beams", type=int, default=NUM_BEAMS)
+    p.add_argument("--threads", type=int, default=0)
+    p.set_defaults(func=report)
+
+    args = parser.parse_args()
+    if args.command == "report" and args.latency_lines < 1:
+        parser.error("--latency_lines must be at least 1")
+    args.teacher = args.teacher or MODELS[args.lang]
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,36 @@
-import sounddevice as sd
 import numpy as np
-import queue
 from faster_whisper import WhisperModel
+from audio_frames import NativeCapture
 import threading
 import time
 
 class ContinuousSTT:
     def __init__(self, model_size="medium", chunk_duration=1, sample_rate=16000):
-        self.sample_rate = sample_rate
+        self.sample_rate = sample_rate      # Whisper input rate
         self.chunk = chunk_duration
-        self.q = queue.Queue()
+        self.capture = NativeCapture(chunk_duration)
 
         print("Loading Faster-Whisper model...")
         self.model = WhisperModel(model_size, device="cuda", compute_type="float16")
         print("Model loaded!")
 
-    def audio_callback(self, indata, frames, time, status):
-        """Push microphone audio chunks into queue"""
-        if status:
-            print(status)
-        self.q.put(indata.copy())
-
     def start_stream(self):
-        """Start continuous microphone streaming"""
-        self.stream = sd.InputStream(
-            channels=1,
-            samplerate=self.sample_rate,
-            callback=self.audio_callback,
-            blocksize=int(self.sample_rate * self.chunk),
-            dtype=np.float32
-        )
-        self.stream.start()
+        """Start continuous microphone streaming (device native rate)"""
+        self.capture.start()
         print("🎙 Listening...")
 
-    def run(self, callback=None):
+    def run(self, callback=None, on_silence=None):
         """
         Continuously transcribe incoming audio.
         callback(text) → sends each transcription to your translator.
+        on_silence() → called for a chunk that transcribes to nothing
+        (speaker paused), e.g. to close the current utterance.
         """
         audio_buffer = np.zeros(0, dtype=np.float32)
 
         while True:
-            chunk = self.q.get()
-            audio_buffer = np.concatenate((audio_buffer, chunk[:, 0]))
+            chunk = self.capture.read()
+            audio_buffer = np.concatenate((audio_buffer, chunk))
 
             if len(audio_buffer) > self.sample_rate * self.chunk:
                 segments, _ = self.model.transcribe(audio_buffer, beam_size=1)
@@ -54,6 +42,8 @@ class ContinuousSTT:
                         callback(text)
                     else:
                         print("📝 ", text)
+                elif on_silence:
+                    on_silence()
 
                 audio_buffer = np.zeros(0, dtype=np.float32)
 
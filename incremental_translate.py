@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+incremental_translate.py
+
+Incremental re-translation of evolving STT hypotheses (EN -> HI / TE).
+
+Partial transcripts grow and get corrected while the speaker is still
+talking. Instead of translating the whole hypothesis again on every
+revision, the text is split into sentences / clauses and only segments
+that are new or changed are sent to the translator. Translations of
+stable segments are cached, and each update is emitted as a diff against
+the Hindi / Telugu caption currently on screen.
+
+Usage:
+  python3 incremental_translate.py              # live mic (fast_stream_stt)
+  python3 incremental_translate.py --backend marian --shortlist_dir shortlists
+  python3 incremental_translate.py --backend multilingual
+  python3 incremental_translate.py --backend student
+  python3 incremental_translate.py --simulate   # replay growing hypotheses
+"""
+
+import re
+import time
+import argparse
+from collections import OrderedDict
+from text_normalize import normalize_text
+
+TARGET_LANGS = ("hi", "te")
+CACHE_SIZE = 4096
+TAIL_STEP = 3       # re-translate an unfinished clause every N new words
+
+# A segment ends at sentence punctuation or at a clause break (, ; :)
+# followed by whitespace, so "1,000" is not split.
+SEGMENT_RE = re.compile(r'\S.*?(?:[.!?]+(?=\s|$)|[,;:](?=\s)|$)')
+SEGMENT_END = (".", "!", "?", ",", ";", ":")
+
+# ----------------------------------------------------------------------
+# Segmentation
+# ----------------------------------------------------------------------
+
+def split_segments(text: str):
+    """Split an STT hypothesis into sentence / clause segments."""
+    text = normalize_text(text)
+    return [m.group(0).strip() for m in SEGMENT_RE.finditer(text)]
+
+# ----------------------------------------------------------------------
+# Translation backends
+#
+# A backend is a callable taking a list of (lang, text) requests and
+# returning the list of translations in the same order.
+# ----------------------------------------------------------------------
+
+def translate_lib_backend():
+    """Backend using the `translate` package (same as speech_translate1)."""
+    from translate import Translator
+
+    translators = {}
+
+    def backend(requests):
+        out = []
+        for lang, text in requests:
+            if lang not in translators:
+                translators[lang] = Translator(from_lang="en", to_lang=lang)
+            out.append(translators[lang].translate(text))
+        return out
+
+    return backend
+
+def make_backend(args):
+    if args.backend in ("marian", "student"):
+        from marian_translate import MODELS, STUDENT_MODELS, MarianTranslator
+
+        models = STUDENT_MODELS if args.backend == "student" else MODELS
+        return MarianTranslator(models, device=args.device, shortlist_dir=args.shortlist_dir)
+    if args.backend == "multilingual":
+        from multilingual_translate import MultilingualTranslator
+
+        return MultilingualTranslator(device=args.device)
+    return translate_lib_backend()
+
+# ----------------------------------------------------------------------
+# Incremental translator
+# ----------------------------------------------------------------------
+
+class IncrementalTranslator:
+    def __init__(self, backend, langs=TARGET_LANGS, cache_size=CACHE_SIZE,
+                 tail_step=TAIL_STEP):
+        self.backend = backend
+        self.langs = tuple(langs)
+        self.cache_size = cache_size
+        self.tail_step = tail_step
+        self.cache = OrderedDict()
+        self.shown = {lang: [] for lang in self.langs}
+        self.tail = None        # (index, source, translations) of open clause
+        self.hypothesis = ""
+        self.calls = 0          # segments sent to the backend
+        self.hits = 0           # segments served from the cache
+
+    def _lookup(self, key):
+        value = self.cache.get(key)
+        if value is not None:
+            self.cache.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        self.cache[key] = value
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _translate(self, segments):
+        """Translate segments for every target language, using the cache."""
+        result = {lang: [None] * len(segments) for lang in self.langs}
+        missing = []
+        for lang in self.langs:
+            for i, seg in enumerate(segments):
+                cached = self._lookup((lang, seg))
+                if cached is None:
+                    missing.append((lang, i, seg))
+                else:
+                    result[lang][i] = cached
+                    self.hits += 1
+
+        if missing:
+            self.calls += len(missing)
+            try:
+                outs = self.backend([(lang, seg) for lang, _, seg in missing])
+            except Exception as e:
+                # errors are shown but never cached
+                outs = [f"[Error: {e}]"] * len(missing)
+                for (lang, i, _), out in zip(missing, outs):
+                    result[lang][i] = out
+                return result
+            for (lang, i, seg), out in zip(missing, outs):
+                out = out.strip()
+                result[lang][i] = out
+                self._store((lang, seg), out)
+        return result
+
+    def update(self, hypothesis: str, final=False):
+        """
+        Feed the latest STT hypothesis for the current utterance.
+
+        Returns {lang: (keep, text)} for every caption that changed:
+        keep the first `keep` characters of the displayed caption and
+        append `text`. With final=True the unfinished clause is always
+        translated (see finalize()).
+        """
+        self.hypothesis = hypothesis
+        segments = split_segments(hypothesis)
+        last = len(segments) - 1
+
+        if not final and last >= 0 and self._hold_tail(last, segments[last]):
+            # unfinished clause grew by only a word or two: keep showing
+            # its previous translation until it settles
+            translated = self._translate(segments[:last])
+            for lang in self.langs:
+                translated[lang].append(self.tail[2][lang])
+        else:
+            translated = self._translate(segments)
+            if not final and last >= 0 and not segments[last].endswith(SEGMENT_END):
+                self.tail = (last, segments[last],
+                             {lang: translated[lang][last] for lang in self.langs})
+            else:
+                self.tail = None
+
+        diffs = {}
+        for lang in self.langs:
+            old, new = self.shown[lang], translated[lang]
+            i = 0
+            while i < len(old) and i < len(new) and old[i] == new[i]:
+                i += 1
+            if i == len(old) == len(new):
+                continue
+            keep = len(" ".join(old[:i]))
+            tail = " ".join(new[i:])
+            if i and tail:
+                tail = " " + tail
+            diffs[lang] = (keep, tail)
+            self.shown[lang] = new
+        return diffs
+
+    def _hold_tail(self, index, segment):
+        if self.tail is None or segment.endswith(SEGMENT_END):
+            return False
+        t_index, t_src, _ = self.tail
+        if index != t_index or not segment.startswith(t_src):
+            return False
+        return len(segment.split()) - len(t_src.split()) < self.tail_step
+
+    def caption(self, lang):
+        return " ".join(self.shown[lang])
+
+    def finalize(self):
+        """
+        End of utterance (sentence end or silence): translate the held
+        unfinished clause so the caption covers every word. Returns diffs
+        like update().
+        """
+        if self.tail is None:
+            return {}
+        return self.update(self.hypothesis, final=True)
+
+    def reset(self):
+        """Start a new utterance (cache is kept)."""
+        self.shown = {lang: [] for lang in self.langs}
+        self.tail = None
+        self.hypothesis = ""
+
+
+def apply_diff(caption, diff):
+    keep, text = diff
+    return caption[:keep] + text
+
+# ----------------------------------------------------------------------
+# Simulation / benchmark
+# ----------------------------------------------------------------------
+
+SAMPLE_UTTERANCES = [
+    "hello world, how are you. I am waiting for you at the station, "
+    "the train is late by twenty minutes.",
+    "I am going to Mumbai tomorrow, my brother lives there. "
+    "We will meet at his office, then go for dinner.",
+    "I am going to Mumbai tomorrow to meet him",
+]
+
+def growing_hypotheses(utterance):
+    """Word-by-word partial hypotheses, like a streaming recognizer."""
+    words = utterance.split()
+    for n in range(1, len(words) + 1):
+        yield " ".join(words[:n])
+
+def fake_backend(per_call=0.02, per_word=0.002):
+    """Offline backend with latency roughly proportional to input size."""
+    def backend(requests):
+        out = []
+        for lang, text in requests:
+            time.sleep(per_call + per_word * len(text.split()))
+            out.append(f"<{lang}:{text}>")
+        return out
+    return backend
+
+def simulate(backend):
+    # Baseline: translate the full hypothesis into both languages each time
+    full_calls, full_lat = 0, []
+    for utt in SAMPLE_UTTERANCES:
+        for hyp in growing_hypotheses(utt):
+            t0 = time.perf_counter()
+            backend([(lang, hyp) for lang in TARGET_LANGS])
+            full_lat.append(time.perf_counter() - t0)
+            full_calls += len(TARGET_LANGS)
+
+    inc = IncrementalTranslator(backend)
+    inc_lat = []
+    for utt in SAMPLE_UTTERANCES:
+        inc.reset()
+        captions = {lang: "" for lang in TARGET_LANGS}
+        for hyp in growing_hypotheses(utt):
+            t0 = time.perf_counter()
+            for lang, diff in inc.update(hyp).items():
+                captions[lang] = apply_diff(captions[lang], diff)
+            inc_lat.append(time.perf_counter() - t0)
+        # speaker stops: flush any held unfinished clause
+        t0 = time.perf_counter()
+        for lang, diff in inc.finalize().items():
+            captions[lang] = apply_diff(captions[lang], diff)
+        inc_lat.append(time.perf_counter() - t0)
+        for lang in TARGET_LANGS:
+            assert captions[lang] == inc.caption(lang)
+
+    n_utt = len(SAMPLE_UTTERANCES)
+    print("Hypotheses replayed:", len(full_lat))
+    print(f"Full re-translation : {full_calls / n_utt:7.1f} calls/utterance, "
+          f"mean caption latency {1000 * sum(full_lat) / len(full_lat):7.1f} ms")
+    print(f"Incremental         : {inc.calls / n_utt:7.1f} calls/utterance, "
+          f"mean caption latency {1000 * sum(inc_lat) / len(inc_lat):7.1f} ms "
+          f"({inc.hits} cache hits)")
+
+# ----------------------------------------------------------------------
+# Live captions
+# ----------------------------------------------------------------------
+
+class LiveCaptions:
+    """
+    Glue between ContinuousSTT callbacks and IncrementalTranslator: each
+    transcribed chunk extends the current utterance, which ends at a
+    sentence end or at a chunk that transcribes to nothing (pause).
+    Captions are kept up to date by applying the emitted diffs.
+    """
+
+    def __init__(self, inc, show=print):
+        self.inc = inc
+        self.show = show
+        self.hypothesis = ""
+        self.captions = {lang: "" for lang in inc.langs}
+
+    def _apply(self, diffs):
+        for lang, diff in diffs.items():
+            self.captions[lang] = apply_diff(self.captions[lang], diff)
+            self.show(f"[{lang}] {self.captions[lang]}")
+
+    def on_text(self, text):
+        self.hypothesis = (self.hypothesis + " " + text).strip()
+        self._apply(self.inc.update(self.hypothesis))
+        if self.hypothesis.endswith((".", "!", "?")):
+            self.end_utterance()
+
+    def on_silence(self):
+        if self.hypothesis:
+            self.end_utterance()
+
+    def end_utterance(self):
+        self._apply(self.inc.finalize())
+        self.inc.reset()
+        self.hypothesis = ""
+        self.captions = {lang: "" for lang in self.inc.langs}
+
+# ----------------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------------
+
+def run_live(backend):
+    from fast_stream_stt import ContinuousSTT
+
+    live = LiveCaptions(IncrementalTranslator(backend))
+    stt = ContinuousSTT("medium")
+    stt.start_stream()
+    stt.run(callback=live.on_text, on_silence=live.on_silence)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simulate", action="store_true",
+                        help="Replay growing hypotheses offline and report call counts / latency")
+    parser.add_argument("--backend", choices=["translate", "marian", "multilingual", "student"],
+                        default="translate")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--shortlist_dir", type=str, default=None,
+                        help="Marian vocabulary shortlists (see vocab_shortlist.py)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(fake_backend())
+    else:
+        run_live(make_backend(args))
+
+if __name__ == "__main__":
+    main()
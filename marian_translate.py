@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+marian_translate.py
+
+Local Marian (opus-mt) translation backend for the live pipeline.
+
+MarianTranslator is a backend for incremental_translate: it takes a list
+of (lang, text) requests and returns translations in the same order,
+batching all requests of one language into a single generate call.
+
+Usage:
+  python3 marian_translate.py --text "I am going to Mumbai"
+  python3 marian_translate.py --text "..." --shortlist_dir shortlists
+  python3 marian_translate.py --text "..." --student
+"""
+
+import os
+import argparse
+
+MODELS = {
+    "hi": "Helsinki-NLP/opus-mt-en-hi",
+    "te": "Helsinki-NLP/opus-mt-en-te",
+}
+
+# Distilled students (see distill.py); same tokenizers as the teachers
+STUDENT_MODELS = {
+    "hi": "models/student-en-hi",
+    "te": "models/student-en-te",
+}
+
+MAX_LEN = 128
+NUM_BEAMS = 4
+
+
+class MarianTranslator:
+    def __init__(self, models=MODELS, device="cpu", shortlist_dir=None,
+                 max_length=MAX_LEN, num_beams=NUM_BEAMS):
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        self.device = device
+        self.max_length = max_length
+        self.num_beams = num_beams
+        self.tokenizers = {}
+        self.models = {}
+        self.shortlists = {}
+
+        for lang, name in models.items():
+            print(f"Loading {name} ...")
+            self.tokenizers[lang] = AutoTokenizer.from_pretrained(name)
+            self.models[lang] = AutoModelForSeq2SeqLM.from_pretrained(name).to(device).eval()
+
+            path = os.path.join(shortlist_dir, f"{lang}.json") if shortlist_dir else None
+            if path and os.path.exists(path):
+                from vocab_shortlist import ShortlistGenerator
+
+                self.shortlists[lang] = ShortlistGenerator.load(
+                    self.models[lang], self.tokenizers[lang], path)
+                print(f"  using vocabulary shortlist {path}")
+
+    def translate_batch(self, texts, lang):
+        import torch
+
+        tok = self.tokenizers[lang]
+        batch = tok(texts, return_tensors="pt", padding=True, truncation=True,
+                    max_length=self.max_length).to(self.device)
+        with torch.no_grad():
+            if lang in self.shortlists:
+                out = self.shortlists[lang].generate(
+                    batch, max_length=self.max_length, num_beams=self.num_beams)
+            else:
+                out = self.models[lang].generate(
+                    **batch, max_length=self.max_length, num_beams=self.num_beams)
+        return [t.strip() for t in tok.batch_decode(out, skip_special_tokens=True)]
+
+    def __call__(self, requests):
+        out = [None] * len(requests)
+        for lang in {lang for lang, _ in requests}:
+            idx = [i for i, (l, _) in enumerate(requests) if l == lang]
+            for i, text in zip(idx, self.translate_batch([requests[i][1] for i in idx], lang)):
+                out[i] = text
+        return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--text", type=str, required=True)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--shortlist_dir", type=str, default=None)
+    parser.add_argument("--student", action="store_true",
+                        help="Use the distilled student models")
+    args = parser.parse_args()
+
+    translator = MarianTranslator(STUDENT_MODELS if args.student else MODELS,
+                                  device=args.device, shortlist_dir=args.shortlist_dir)
+    hi, te = translator([("hi", args.text), ("te", args.text)])
+    print("English:", args.text)
+    print("Hindi  :", hi)
+    print("Telugu :", te)
@@ -9,15 +9,18 @@ Creates final files in:
     data/valid.* 
     data/test.*
 
+{split}.en is the English side of the EN–HI pairs; the English side of
+the EN–TE pairs is written to {split}.en-te.en (see corpus_files.SRC_FILES).
+
 Works with your current directory structure exactly as shown.
 """
 
 import os
-import re
 import random
 from glob import glob
-import unicodedata
 from tqdm import tqdm
+from text_normalize import normalize_text
+from corpus_files import SRC_FILES
 
 DATA_RAW = "data_raw"
 OUT_DIR = "data"
@@ -27,17 +30,9 @@ os.makedirs(OUT_DIR, exist_ok=True)
 # Cleaning utilities
 # ----------------------------------------------------------------------
 
-URL_RE = re.compile(r'https?://\S+|www\.\S+')
-HTML_RE = re.compile(r'<[^>]+>')
-MULTISPACE_RE = re.compile(r'\s+')
-
 def clean_text(text: str) -> str:
-    text = text.strip()
-    text = unicodedata.normalize("NFKC", text)
-    text = URL_RE.sub("", text)
-    text = HTML_RE.sub("", text)
-    text = MULTISPACE_RE.sub(" ", text)
-    return text.strip()
+    # same normalization as tokenizer training and the live pipeline
+    return normalize_text(text)
 
 def read_lines(fpath):
     if not os.path.exists(fpath):
@@ -163,7 +158,13 @@ def merge_and_split(iitb, iitb_dev, iitb_test, opus_hi, opus_te):
     # Shuffle EN-TE
     en_te_pairs = list(zip(train_en_te, train_te))
     random.shuffle(en_te_pairs)
-    train_en_te, train_te = zip(*en_te_pairs)
+
+    # Hold out EN-TE valid/test pairs (same sizes as IITB dev/test);
+    # there is no separate EN-TE dev/test corpus
+    n_valid, n_test = len(dev_en), len(test_en)
+    valid_en_te, valid_te = zip(*en_te_pairs[:n_valid]) if n_valid else ((), ())
+    test_en_te, test_te = zip(*en_te_pairs[n_valid:n_valid + n_test]) if n_test else ((), ())
+    train_en_te, train_te = zip(*en_te_pairs[n_valid + n_test:])
 
     # Save final files
     print("\nWriting final train/valid/test files...")
@@ -171,7 +172,8 @@ def merge_and_split(iitb, iitb_dev, iitb_test, opus_hi, opus_te):
     # TRAIN
     with open(os.path.join(OUT_DIR, "train.en"), "w", encoding="utf-8") as fe, \
          open(os.path.join(OUT_DIR, "train.hi"), "w", encoding="utf-8") as fhi, \
-         open(os.path.join(OUT_DIR, "train.te"), "w", encoding="utf-8") as fte:
+         open(os.path.join(OUT_DIR, "train.te"), "w", encoding="utf-8") as fte, \
+         open(os.path.join(OUT_DIR, SRC_FILES["te"].format(split="train")), "w", encoding="utf-8") as fete:
 
         for line in train_en_hi:
             fe.write(line + "\n")
@@ -179,30 +181,38 @@ def merge_and_split(iitb, iitb_dev, iitb_test, opus_hi, opus_te):
             fhi.write(line + "\n")
         for line in train_te:
             fte.write(line + "\n")
+        for line in train_en_te:
+            fete.write(line + "\n")
 
     # VALID
     with open(os.path.join(OUT_DIR, "valid.en"), "w", encoding="utf-8") as fe, \
          open(os.path.join(OUT_DIR, "valid.hi"), "w", encoding="utf-8") as fhi, \
-         open(os.path.join(OUT_DIR, "valid.te"), "w", encoding="utf-8") as fte:
+         open(os.path.join(OUT_DIR, "valid.te"), "w", encoding="utf-8") as fte, \
+         open(os.path.join(OUT_DIR, SRC_FILES["te"].format(split="valid")), "w", encoding="utf-8") as fete:
 
         for line in dev_en:
             fe.write(line + "\n")
         for line in dev_hi:
             fhi.write(line + "\n")
-        for line in train_te[:len(dev_en)]:
+        for line in valid_te:
             fte.write(line + "\n")
+        for line in valid_en_te:
+            fete.write(line + "\n")
 
     # TEST
     with open(os.path.join(OUT_DIR, "test.en"), "w", encoding="utf-8") as fe, \
          open(os.path.join(OUT_DIR, "test.hi"), "w", encoding="utf-8") as fhi, \
-         open(os.path.join(OUT_DIR, "test.te"), "w", encoding="utf-8") as fte:
+         open(os.path.join(OUT_DIR, "test.te"), "w", encoding="utf-8") as fte, \
+         open(os.path.join(OUT_DIR, SRC_FILES["te"].format(split="test")), "w", encoding="utf-8") as fete:
 
         for line in test_en:
             fe.write(line + "\n")
         for line in test_hi:
             fhi.write(line + "\n")
-        for line in train_te[len(dev_en):len(dev_en)+len(test_en)]:
+        for line in test_te:
             fte.write(line + "\n")
+        for line in test_en_te:
+            fete.write(line + "\n")
 
     print("\nDONE! Final dataset ready in ./data/")
     print("Files created:")
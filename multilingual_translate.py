@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+multilingual_translate.py
+
+One shared EN -> HI/TE Marian model driven by the target-language tags
+(>>hi<<, >>te<<) reserved in the repo's SentencePiece model, instead of
+two separate opus-mt models.
+
+Steps:
+  tokenizer   build a MarianTokenizer from spiece.model / spiece.vocab
+  train       train the shared model on tagged EN-HI + EN-TE pairs
+  compare     resident memory and per-utterance latency vs the
+              two-model setup (each setup measured in its own process)
+
+At inference time both targets for an utterance go into one batch and
+one generate() call.
+
+Usage:
+  python3 multilingual_translate.py tokenizer
+  python3 multilingual_translate.py train --epochs 3
+  python3 multilingual_translate.py compare --max_lines 200
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+
+from marian_translate import MAX_LEN, NUM_BEAMS
+from corpus_files import SRC_FILES
+
+SPM_MODEL = "spiece.model"
+SPM_VOCAB = "spiece.vocab"
+TOKENIZER_DIR = "tokenizer/marian"
+MODEL_DIR = "models/multilingual-en-hi-te"
+DATA_DIR = "data"
+
+# ----------------------------------------------------------------------
+# Tokenizer
+# ----------------------------------------------------------------------
+
+def build_tokenizer(args):
+    from transformers import MarianTokenizer
+
+    # spiece.vocab order == SentencePiece ids; the model was trained
+    # without </s>, so it is appended as the EOS token
+    vocab = {}
+    with open(args.spm_vocab, "r", encoding="utf-8") as f:
+        for line in f:
+            piece = line.rstrip("\n").split("\t")[0]
+            vocab[piece] = len(vocab)
+    vocab.setdefault("</s>", len(vocab))
+
+    os.makedirs(args.tokenizer_dir, exist_ok=True)
+    vocab_path = os.path.join(args.tokenizer_dir, "vocab.json")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+
+    tok = MarianTokenizer(
+        source_spm=args.spm_model,
+        target_spm=args.spm_model,
+        vocab=vocab_path,
+        eos_token="</s>",
+        unk_token="<unk>",
+        pad_token="<pad>",
+        model_max_length=MAX_LEN,
+    )
+    tok.save_pretrained(args.tokenizer_dir)
+    print(f"Tokenizer ({len(tok)} tokens) saved to: {args.tokenizer_dir}")
+    print("  >>hi<< hello ->", tok.tokenize(">>hi<< hello"))
+
+# ----------------------------------------------------------------------
+# Training
+# ----------------------------------------------------------------------
+
+def load_tagged(data_dir, split, max_lines=None):
+    """Tagged parallel pairs for both targets: (">>lang<< en", tgt)."""
+    src, tgt = [], []
+    for lang in ("hi", "te"):
+        src_path = os.path.join(data_dir, SRC_FILES[lang].format(split=split))
+        tgt_path = os.path.join(data_dir, f"{split}.{lang}")
+        with open(src_path, "r", encoding="utf-8") as fs, \
+             open(tgt_path, "r", encoding="utf-8") as ft:
+            for n, (s, t) in enumerate(zip(fs, ft)):
+                if max_lines and n >= max_lines:
+                    break
+                s, t = s.strip(), t.strip()
+                if s and t:
+                    src.append(f">>{lang}<< {s}")
+                    tgt.append(t)
+    return src, tgt
+
+def train(args):
+    from datasets import Dataset
+    from transformers import (MarianTokenizer, MarianConfig, MarianMTModel,
+                              Seq2SeqTrainingArguments, Seq2SeqTrainer,
+                              DataCollatorForSeq2Seq)
+
+    tokenizer = MarianTokenizer.from_pretrained(args.tokenizer_dir)
+    config = MarianConfig(
+        vocab_size=len(tokenizer),
+        decoder_vocab_size=len(tokenizer),
+        d_model=512,
+        encoder_layers=6,
+        decoder_layers=6,
+        encoder_attention_heads=8,
+        decoder_attention_heads=8,
+        encoder_ffn_dim=2048,
+        decoder_ffn_dim=2048,
+        max_position_embeddings=512,
+        pad_token_id=tokenizer.pad_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        decoder_start_token_id=tokenizer.pad_token_id,
+        forced_eos_token_id=tokenizer.eos_token_id,
+        share_encoder_decoder_embeddings=True,
+    )
+    model = MarianMTModel(config)
+
+    max_lines = args.max_lines or None
+    src, tgt = load_tagged(args.data_dir, "train", max_lines)
+    pairs = list(zip(src, tgt))
+    random.shuffle(pairs)
+    train_ds = Dataset.from_dict({"src": [p[0] for p in pairs], "tgt": [p[1] for p in pairs]})
+    v_src, v_tgt = load_tagged(args.data_dir, "valid", max_lines)
+    valid_ds = Dataset.from_dict({"src": v_src, "tgt": v_tgt})
+    print("Train examples:", len(train_ds))
+    print("Valid examples:", len(valid_ds))
+
+    def preprocess_batch(batch):
+        inputs = tokenizer(batch["src"], truncation=True, max_length=MAX_LEN)
+        labels = tokenizer(text_target=batch["tgt"], truncation=True, max_length=MAX_LEN)
+        inputs["labels"] = labels["input_ids"]
+        return inputs
+
+    train_ds = train_ds.map(preprocess_batch, batched=True, remove_columns=["src", "tgt"])
+    valid_ds = valid_ds.map(preprocess_batch, batched=True, remove_columns=["src", "tgt"])
+
+    training_args = Seq2SeqTrainingArguments(
+        output_dir=os.path.join(args.model_dir, "checkpoints"),
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        gradient_accumulation_steps=args.grad_accum,
+        num_train_epochs=args.epochs,
+        learning_rate=args.lr,
+        warmup_steps=4000,
+        logging_steps=200,
+        save_total_limit=3,
+        report_to="none",
+    )
+    trainer = Seq2SeqTrainer(
+        model=model,
+        args=training_args,
+        train_dataset=train_ds,
+        eval_dataset=valid_ds,
+        tokenizer=tokenizer,
+        data_collator=DataCollatorForSeq2Seq(tokenizer, model=model),
+    )
+    trainer.train()
+    trainer.save_model(args.model_dir)
+    tokenizer.save_pretrained(args.model_dir)
+    print("Saved multilingual model to", args.model_dir)
+
+# ----------------------------------------------------------------------
+# Inference backend
+# ----------------------------------------------------------------------
+
+class MultilingualTranslator:
+    """
+    Backend for incremental_translate: all (lang, text) requests, both
+    targets included, are decoded together in one generate() call.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, device="cpu",
+                 max_length=MAX_LEN, num_beams=NUM_BEAMS):
+        from transformers import MarianTokenizer, MarianMTModel
+
+        print(f"Loading {model_dir} ...")
+        self.device = device
+        self.max_length = max_length
+        self.num_beams = num_beams
+        self.tokenizer = MarianTokenizer.from_pretrained(model_dir)
+        self.model = MarianMTModel.from_pretrained(model_dir).to(device).eval()
+
+    def __call__(self, requests):
+        import torch
+
+        texts = [f">>{lang}<< {text}" for lang, text in requests]
+        batch = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True,
+                               max_length=self.max_length).to(self.device)
+        with torch.no_grad():
+            out = self.model.generate(**batch, max_length=self.max_length,
+                                      num_beams=self.num_beams)
+        return [t.strip() for t in self.tokenizer.batch_decode(out, skip_special_tokens=True)]
+
+# ----------------------------------------------------------------------
+# Two-model vs multilingual comparison
+# ----------------------------------------------------------------------
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform != "darwin" else rss / (1024 * 1024)
+
+def measure(args):
+    """Runs in a child process so each setup gets its own resident memory."""
+    import torch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.setup == "two":
+        from marian_translate import MarianTranslator
+        backend = MarianTranslator(device=args.device)
+    else:
+        backend = MultilingualTranslator(args.model_dir, device=args.device)
+    rss_loaded = peak_rss_mb()
+
+    path = os.path.join(args.data_dir, "valid.en")
+    with open(path, "r", encoding="utf-8") as f:
+        utterances = [ln.strip() for ln, _ in zip(f, range(args.max_lines)) if ln.strip()]
+
+    backend([("hi", utterances[0]), ("te", utterances[0])])     # warm up
+    lat = []
+    for utt in utterances:
+        t0 = time.perf_counter()
+        backend([("hi", utt), ("te", utt)])
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+
+    print(json.dumps({
+        "setup": args.setup,
+        "rss_loaded_mb": rss_loaded,
+        "rss_peak_mb": peak_rss_mb(),
+        "mean_ms": 1000 * sum(lat) / len(lat),
+        "p50_ms": 1000 * lat[len(lat) // 2],
+        "p95_ms": 1000 * lat[int(len(lat) * 0.95)],
+        "utterances": len(lat),
+    }))
+
+def compare(args):
+    labels = {"two": "two models (opus-mt en-hi + en-te)",
+              "multi": "one multilingual model, 1 batch"}
+    results = []
+    for setup in ("two", "multi"):
+        cmd = [sys.executable, __file__, "measure", "--setup", setup,
+               "--model_dir", args.model_dir, "--data_dir", args.data_dir,
+               "--max_lines", str(args.max_lines), "--device", args.device,
+               "--threads", str(args.threads)]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"\nPer-utterance translation into Hindi + Telugu "
+          f"({results[0]['utterances']} utterances from valid.en)")
+    for r in results:
+        print(f"  {labels[r['setup']]:36s} RSS loaded {r['rss_loaded_mb']:8.1f} MB  "
+              f"peak {r['rss_peak_mb']:8.1f} MB  latency mean {r['mean_ms']:7.1f} ms  "
+              f"p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms")
+
+# ----------------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("tokenizer", help="Build a MarianTokenizer from spiece.model")
+    p.add_argument("--spm_model", type=str, default=SPM_MODEL)
+    p.add_argument("--spm_vocab", type=str, default=SPM_VOCAB)
+    p.add_argument("--tokenizer_dir", type=str, default=TOKENIZER_DIR)
+    p.set_defaults(func=build_tokenizer)
+
+    p = sub.add_parser("train", help="Train the shared EN -> HI/TE model")
+    p.add_argument("--tokenizer_dir", type=str, default=TOKENIZER_DIR)
+    p.add_argument("--model_dir", type=str, default=MODEL_DIR)
+    p.add_argument("--data_dir", type=str, default=DATA_DIR)
+    p.add_argument("--max_lines", type=int, default=0,
+                   help="Max pairs per language (0 = unlimited)")
+    p.add_argument("--batch_size", type=int, default=32)
+    p.add_argument("--grad_accum", type=int, default=4)
+    p.add_argument("--epochs", type=int, default=3)
+    p.add_argument("--lr", type=float, default=5e-4)
+    p.set_defaults(func=train)
+
+    for name, func, help_text in (
+            ("compare", compare, "Memory / latency vs the two-model setup"),
+            ("measure", measure, "Measure one setup (run by compare)")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--model_dir", type=str, default=MODEL_DIR)
+        p.add_argument("--data_dir", type=str, default=DATA_DIR)
+        p.add_argument("--max_lines", type=int, default=200)
+        p.add_argument("--device", type=str, default="cpu")
+        p.add_argument("--threads", type=int, default=0)
+        if name == "measure":
+            p.add_argument("--setup", choices=["two", "multi"], required=True)
+        p.set_defaults(func=func)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
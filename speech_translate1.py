@@ -4,10 +4,34 @@ import speech_recognition as sr
 from translate import Translator
 from gtts import gTTS
 import os
+from text_normalize import normalize_text
+from streaming_tts import PIPER_VOICES, PiperEngine, SoundDevicePlayer, StreamingTTS
 
 OUTPUT_FILE = "speech_translations.txt"
 
+_piper_hi = None
+
 def speak_hindi(text):
+    # Local Piper voice if present: playback starts after the first phrase
+    global _piper_hi
+    if os.path.exists(PIPER_VOICES["hi"]):
+        try:
+            if _piper_hi is None:
+                _piper_hi = PiperEngine(PIPER_VOICES["hi"])
+            player = SoundDevicePlayer(_piper_hi.sample_rate)
+            print("[TTS] Streaming Hindi audio...")
+            try:
+                stats = StreamingTTS(_piper_hi, player).speak(text)
+            finally:
+                player.close()
+            if stats["first_audio"] is not None:
+                print(f"[TTS] first audio {stats['first_audio']:.2f}s, "
+                      f"synthesis {stats['synthesis']:.2f}s")
+            return
+        except Exception as e:
+            # also raised by speak() when Piper fails mid-text
+            print(f"[TTS Error]: {e} (falling back to gTTS)")
+
     try:
         tts = gTTS(text=text, lang="hi")
         filename = "hindi_output.mp3"
@@ -62,7 +86,7 @@ def main():
     
     while True:
         try:
-            english_text = recognize_from_mic()
+            english_text = normalize_text(recognize_from_mic())
             print("\nRecognized English:", english_text)
         except Exception as e:
             print("Recognition error:", e)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+streaming_tts.py
+
+Streaming local TTS for translated Hindi / Telugu text.
+
+The text is split into sentences / phrases, each phrase is synthesized by
+a local engine on a worker thread, and playback of the first phrase
+starts while the rest are still being synthesized. Time-to-first-audio
+is reported separately from total synthesis time.
+
+Engines:
+  piper   local Piper voice (.onnx), e.g. from rhasspy/piper-voices
+  dummy   no model, no sound device; tone of text-proportional length
+          (for headless runs)
+
+Usage:
+  python3 streaming_tts.py --engine dummy --text "नमस्ते दुनिया। आप कैसे हैं?"
+  python3 streaming_tts.py --engine piper --lang te --text "..."
+"""
+
+import re
+import time
+import queue
+import argparse
+import threading
+import numpy as np
+
+PIPER_VOICES = {
+    "hi": "voices/hi_IN-pratham-medium.onnx",
+    "te": "voices/te_IN-maya-medium.onnx",
+}
+
+MAX_PHRASE_CHARS = 80
+
+# Sentence ends (incl. Devanagari danda) and, for long sentences, commas
+SENTENCE_RE = re.compile(r'[^।॥.!?]+[।॥.!?]*')
+PHRASE_RE = re.compile(r'[^,;]+[,;]*')
+
+# ----------------------------------------------------------------------
+# Text chunking
+# ----------------------------------------------------------------------
+
+def split_phrases(text: str, max_chars=MAX_PHRASE_CHARS):
+    """Split into sentences; long sentences are further split at , and ;"""
+    out = []
+    for sent in SENTENCE_RE.findall(text):
+        sent = sent.strip()
+        if not sent:
+            continue
+        if len(sent) <= max_chars:
+            out.append(sent)
+            continue
+        out.extend(p.strip() for p in PHRASE_RE.findall(sent) if p.strip())
+    return out
+
+# ----------------------------------------------------------------------
+# Engines: synthesize(text) -> int16 mono samples at engine.sample_rate
+# ----------------------------------------------------------------------
+
+class PiperEngine:
+    def __init__(self, model_path):
+        from piper.voice import PiperVoice
+
+        self.voice = PiperVoice.load(model_path)
+        self.sample_rate = self.voice.config.sample_rate
+
+    def synthesize(self, text):
+        raw = b"".join(self.voice.synthesize_stream_raw(text))
+        return np.frombuffer(raw, dtype=np.int16)
+
+class DummyEngine:
+    """Emits a quiet tone; sleeps `rtf` x audio duration to mimic compute."""
+
+    def __init__(self, sample_rate=22050, seconds_per_char=0.06, rtf=0.2):
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.rtf = rtf
+
+    def synthesize(self, text):
+        duration = len(text) * self.seconds_per_char
+        time.sleep(duration * self.rtf)
+        t = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+        return (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+# ----------------------------------------------------------------------
+# Players
+# ----------------------------------------------------------------------
+
+class SoundDevicePlayer:
+    def __init__(self, sample_rate):
+        import sounddevice as sd
+
+        self.stream = sd.OutputStream(samplerate=sample_rate, channels=1, dtype=np.int16)
+        self.stream.start()
+
+    def play(self, samples):
+        self.stream.write(samples)      # blocks until queued to the device
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+class NullPlayer:
+    """Discards audio (optionally in real time) for headless runs."""
+
+    def __init__(self, sample_rate, realtime=False):
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.samples_played = 0
+
+    def play(self, samples):
+        self.samples_played += len(samples)
+        if self.realtime:
+            time.sleep(len(samples) / self.sample_rate)
+
+    def close(self):
+        pass
+
+# ----------------------------------------------------------------------
+# Streaming synthesis + playback
+# ----------------------------------------------------------------------
+
+class StreamingTTS:
+    def __init__(self, engine, player):
+        self.engine = engine
+        self.player = player
+
+    def speak(self, text):
+        """
+        Synthesize and play `text` phrase by phrase. Returns timings in
+        seconds: first_audio (start -> first phrase handed to the player,
+        None if nothing was played), synthesis (start -> last phrase
+        synthesized), total (start -> all audio played).
+
+        If the engine fails, audio synthesized so far is still played and
+        the engine's exception is then re-raised, so callers can fall back.
+        """
+        phrases = split_phrases(text)
+        chunks = queue.Queue()
+        stats = {"phrases": len(phrases), "first_audio": None}
+        errors = []
+        t0 = time.perf_counter()
+
+        def producer():
+            try:
+                for phrase in phrases:
+                    chunks.put(self.engine.synthesize(phrase))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                stats["synthesis"] = time.perf_counter() - t0
+                chunks.put(None)
+
+        worker = threading.Thread(target=producer, daemon=True)
+        worker.start()
+
+        while True:
+            samples = chunks.get()
+            if samples is None:
+                break
+            if stats["first_audio"] is None:
+                stats["first_audio"] = time.perf_counter() - t0
+            self.player.play(samples)
+
+        worker.join()
+        if errors:
+            raise errors[0]
+        stats["total"] = time.perf_counter() - t0
+        return stats
+
+def speak_blocking(engine, player, text):
+    """Old behaviour: synthesize the whole text, then play it."""
+    t0 = time.perf_counter()
+    samples = engine.synthesize(text)
+    synthesis = time.perf_counter() - t0
+    player.play(samples)
+    return {"first_audio": synthesis, "synthesis": synthesis,
+            "total": time.perf_counter() - t0}
+
+def make_engine(name, lang):
+    if name == "piper":
+        return PiperEngine(PIPER_VOICES[lang])
+    return DummyEngine()
+
+# ----------------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------------
+
+SAMPLE_TEXT = {
+    "hi": "मैं कल मुंबई जा रहा हूँ। मेरा भाई वहाँ रहता है, हम उसके दफ्तर में मिलेंगे। "
+          "फिर हम साथ में रात का खाना खाएँगे।",
+    "te": "నేను రేపు ముంబైకి వెళ్తాను. నా సోదరుడు అక్కడ ఉంటాడు, మేము అతని ఆఫీసులో కలుస్తాము. "
+          "తర్వాత మేము కలిసి రాత్రి భోజనం చేస్తాము.",
+}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=["piper", "dummy"], default="dummy")
+    parser.add_argument("--lang", choices=["hi", "te"], default="hi")
+    parser.add_argument("--text", type=str, default=None)
+    parser.add_argument("--play", action="store_true",
+                        help="Play through the sound device (default: discard audio)")
+    args = parser.parse_args()
+
+    text = args.text or SAMPLE_TEXT[args.lang]
+    engine = make_engine(args.engine, args.lang)
+
+    def player():
+        if args.play:
+            return SoundDevicePlayer(engine.sample_rate)
+        return NullPlayer(engine.sample_rate, realtime=True)
+
+    if not split_phrases(text):
+        print("Nothing to synthesize.")
+        return
+
+    for name, run in (("whole text (before)", lambda p: speak_blocking(engine, p, text)),
+                      ("streaming", lambda p: StreamingTTS(engine, p).speak(text))):
+        p = player()
+        try:
+            stats = run(p)
+        finally:
+            p.close()
+        first = stats["first_audio"]
+        first = f"{1000 * first:8.1f} ms" if first is not None else "     n/a   "
+        print(f"{name:20s} time-to-first-audio {first}  "
+              f"synthesis {1000 * stats['synthesis']:8.1f} ms  "
+              f"total {1000 * stats['total']:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,13 @@
-import sounddevice as sd
 import numpy as np
-import queue
 from faster_whisper import WhisperModel
+from audio_frames import NativeCapture
 import time
 import sys
 
 # ---- IMPORTANT: Your local whisper-medium model path ----
 MODEL_PATH = "/home/neeraj/Desktop/TalkBridge/models/whisper-medium"
 
-SAMPLE_RATE = 16000
 CHUNK_DURATION = 1.0  # seconds
-BLOCKSIZE = int(SAMPLE_RATE * CHUNK_DURATION)
 
 
 class LocalWhisperSTT:
@@ -31,30 +28,18 @@ class LocalWhisperSTT:
             print("\nError:", e)
             sys.exit(1)
 
-        self.q = queue.Queue()
-
-    def audio_callback(self, indata, frames, time_info, status):
-        if status:
-            print("Audio Warning:", status)
-        self.q.put(indata.copy())
+        # native-rate capture, resampled to 16 kHz mono float32
+        self.capture = NativeCapture(CHUNK_DURATION)
 
     def start_stream(self):
         print("🎙 Starting microphone stream... (Ctrl+C to stop)\n")
-
-        self.stream = sd.InputStream(
-            channels=1,
-            samplerate=SAMPLE_RATE,
-            callback=self.audio_callback,
-            blocksize=BLOCKSIZE,
-            dtype=np.float32
-        )
-        self.stream.start()
+        self.capture.start()
 
     def run(self):
         try:
             while True:
                 # get audio chunk
-                audio_chunk = self.q.get()[:, 0].astype(np.float32)
+                audio_chunk = self.capture.read()
 
                 # skip silence
                 if np.abs(audio_chunk).mean() < 1e-5:
@@ -73,8 +58,7 @@ class LocalWhisperSTT:
 
         except KeyboardInterrupt:
             print("\n🛑 Stopped by user.")
-            self.stream.stop()
-            self.stream.close()
+            self.capture.stop()
 
 
 if __name__ == "__main__":
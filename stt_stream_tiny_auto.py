@@ -1,9 +1,8 @@
 import os
-import sounddevice as sd
 import numpy as np
-import queue
 from faster_whisper import WhisperModel
 from huggingface_hub import snapshot_download
+from audio_frames import NativeCapture
 import sys
 
 # ----------------------------------------------------
@@ -12,9 +11,7 @@ import sys
 MODEL_PATH = "/home/neeraj/Desktop/TalkBridge/models/whisper-tiny"
 REPO_ID = "Systran/faster-whisper-tiny"
 
-SAMPLE_RATE = 16000
 CHUNK_DURATION = 0.5   # faster response
-BLOCKSIZE = int(SAMPLE_RATE * CHUNK_DURATION)
 
 
 # ----------------------------------------------------
@@ -50,29 +47,17 @@ class WhisperTinySTT:
             print(str(e))
             sys.exit(1)
 
-        self.q = queue.Queue()
-
-    def audio_callback(self, indata, frames, time_info, status):
-        if status:
-            print("⚠️ Audio Warning:", status)
-        self.q.put(indata.copy())
+        # native-rate capture, resampled to 16 kHz mono float32
+        self.capture = NativeCapture(CHUNK_DURATION)
 
     def start_stream(self):
         print("\n🎙 Starting microphone... (Ctrl+C to stop)\n")
-        self.stream = sd.InputStream(
-            channels=1,
-            samplerate=SAMPLE_RATE,
-            callback=self.audio_callback,
-            blocksize=BLOCKSIZE,
-            dtype=np.float32
-        )
-        self.stream.start()
+        self.capture.start()
 
     def run(self):
         try:
             while True:
-                chunk = self.q.get()
-                audio = chunk[:, 0].astype(np.float32)
+                audio = self.capture.read()
 
                 # Skip silence
                 if np.abs(audio).mean() < 1e-5:
@@ -90,8 +75,7 @@ class WhisperTinySTT:
 
         except KeyboardInterrupt:
             print("\n🛑 Stopped.")
-            self.stream.stop()
-            self.stream.close()
+            self.capture.stop()
 
 
 if __name__ == "__main__":
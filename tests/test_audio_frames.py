@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import audio_frames
+from audio_frames import DownmixResampler, FramePool, NativeCapture, blocksize_for
+
+
+def make_capture(monkeypatch):
+    monkeypatch.setattr(audio_frames, "native_input_format", lambda device=None: (48000, 2))
+    return NativeCapture(0.6, pool_size=2)
+
+
+def feed(cap):
+    block = np.zeros((cap.blocksize, cap.channels), dtype=np.float32)
+    cap.audio_callback(block, cap.blocksize, None, None)
+
+
+def test_pool_counts_drops():
+    pool = FramePool(1, 4, 1)
+    frame = pool.acquire()
+    assert pool.acquire() is None and pool.dropped == 1
+    pool.release(frame)
+    assert pool.acquire() is frame
+
+
+def test_drops_are_reported_rate_limited(monkeypatch, capsys):
+    cap = make_capture(monkeypatch)
+    for _ in range(5):      # consumer not reading: 3 of 5 blocks dropped
+        feed(cap)
+    assert cap.pool.dropped == 3
+
+    cap.read()
+    assert "dropped 3 blocks (1.8s of audio)" in capsys.readouterr().out
+
+    feed(cap)
+    feed(cap)               # pool exhausted again within the interval
+    cap.read()
+    assert capsys.readouterr().out == ""
+
+    cap.report_drops(force=True)
+    assert "dropped 1 blocks" in capsys.readouterr().out
+
+
+def resample_tone(rate, channels, freq=440.0, n_blocks=5):
+    bs = blocksize_for(rate, 0.6)
+    t = np.arange(n_blocks * bs) / rate
+    tone = 0.5 * np.sin(2 * np.pi * freq * t).astype(np.float32)
+    signal = np.repeat(tone[:, None], channels, axis=1)
+    rs = DownmixResampler(rate, channels, bs)
+    # copy: process() reuses its output buffer
+    return np.concatenate([rs.process(signal[i:i + bs]).copy()
+                           for i in range(0, len(signal), bs)])
+
+
+@pytest.mark.parametrize("rate", [48000, 44100])
+def test_resampled_tone_is_continuous(rate):
+    out = resample_tone(rate, 2)
+    assert len(out) == 5 * blocksize_for(rate, 0.6) * 16000 // rate
+
+    # skip the first block (filter warm-up), then least-squares fit a
+    # 440 Hz sine: a wrong rate, gain or a glitch at block boundaries
+    # all leave a large residual
+    y = out[len(out) // 5:].astype(np.float64)
+    t = np.arange(len(y)) / 16000
+    basis = np.stack([np.sin(2 * np.pi * 440 * t), np.cos(2 * np.pi * 440 * t)], axis=1)
+    coef, *_ = np.linalg.lstsq(basis, y, rcond=None)
+    assert np.hypot(*coef) == pytest.approx(0.5, rel=0.01)
+    assert np.max(np.abs(y - basis @ coef)) < 5e-3
+
+
+def test_16k_mono_is_identity():
+    bs = blocksize_for(16000, 0.6)
+    block = np.random.default_rng(0).standard_normal((bs, 1)).astype(np.float32)
+    out = DownmixResampler(16000, 1, bs).process(block)
+    np.testing.assert_array_equal(out, block[:, 0])
+    assert not np.shares_memory(out, block)     # frame goes back to the pool
@@ -0,0 +1,83 @@
+import argparse
+
+import pytest
+
+import distill
+
+
+def run_decode(tmp_path, monkeypatch, shard_lines, max_lines=0):
+    calls = []
+
+    def fake_translate(model, tokenizer, lines, *rest):
+        calls.append(len(lines))
+        return [f"T({line})" for line in lines]
+
+    monkeypatch.setattr(distill, "load_model", lambda name, device: (None, None))
+    monkeypatch.setattr(distill, "translate_sorted", fake_translate)
+    args = argparse.Namespace(
+        lang="hi", teacher="teacher", data_dir=str(tmp_path / "data"),
+        distill_dir=str(tmp_path / "distill"), device="cpu", batch_size=4,
+        num_beams=1, shard_lines=shard_lines, max_lines=max_lines,
+        worker=0, num_workers=1)
+    distill.decode(args)
+    return args, calls
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "train.en").write_text(
+        "".join(f"s{i}\n" for i in range(10)), encoding="utf-8")
+
+
+def merged(args):
+    out = args.distill_dir + "/hi/"
+    with open(out + "train.en", encoding="utf-8") as fe, \
+         open(out + "train.hi", encoding="utf-8") as ft:
+        return [(e.strip(), t.strip()) for e, t in zip(fe, ft)]
+
+
+def test_decode_resumes_and_merge_covers_source(tmp_path, monkeypatch, corpus):
+    args, calls = run_decode(tmp_path, monkeypatch, shard_lines=4)
+    assert calls == [4, 4, 2]
+    _, calls = run_decode(tmp_path, monkeypatch, shard_lines=4)
+    assert calls == []
+    distill.merge(args)
+    assert merged(args) == [(f"s{i}", f"T(s{i})") for i in range(10)]
+
+
+def test_changed_max_lines_redecodes_short_shard(tmp_path, monkeypatch, corpus):
+    run_decode(tmp_path, monkeypatch, shard_lines=4, max_lines=6)
+    args, calls = run_decode(tmp_path, monkeypatch, shard_lines=4)
+    assert calls == [4, 2]          # shard 1 grew from 2 to 4 lines
+    distill.merge(args)
+    assert len(merged(args)) == 10
+
+
+def test_merge_rejects_stale_shards(tmp_path, monkeypatch, corpus):
+    run_decode(tmp_path, monkeypatch, shard_lines=2)
+    args, _ = run_decode(tmp_path, monkeypatch, shard_lines=4)
+    # shards 03/04 from the first run now overlap the 4-line shards
+    with pytest.raises(ValueError, match="gap or overlap"):
+        distill.merge(args)
+
+
+def test_merge_rejects_truncated_shard(tmp_path, monkeypatch, corpus):
+    args, _ = run_decode(tmp_path, monkeypatch, shard_lines=4)
+    path = distill.shard_path(args, 1, "hi")
+    with open(path, encoding="utf-8") as f:
+        rows = f.readlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(rows[:-1])
+    with pytest.raises(ValueError, match="wrong line count"):
+        distill.merge(args)
+
+
+def test_report_rejects_empty_validation(tmp_path):
+    pytest.importorskip("torch")
+    pytest.importorskip("evaluate")
+    (tmp_path / "valid.en").write_text("", encoding="utf-8")
+    (tmp_path / "valid.hi").write_text("", encoding="utf-8")
+    args = argparse.Namespace(lang="hi", data_dir=str(tmp_path), max_lines=10, threads=0)
+    with pytest.raises(ValueError, match="No validation pairs"):
+        distill.report(args)
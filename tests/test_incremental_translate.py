@@ -0,0 +1,79 @@
+from incremental_translate import (IncrementalTranslator, LiveCaptions, apply_diff,
+                                   growing_hypotheses, split_segments)
+
+
+def echo_backend(log):
+    def backend(requests):
+        log.extend(requests)
+        return [f"<{lang}:{text}>" for lang, text in requests]
+    return backend
+
+
+def replay(inc, utterance):
+    captions = {lang: "" for lang in inc.langs}
+    for hyp in growing_hypotheses(utterance):
+        for lang, diff in inc.update(hyp).items():
+            captions[lang] = apply_diff(captions[lang], diff)
+    return captions
+
+
+def test_split_segments():
+    assert split_segments("hello world, how are you. i paid 1,000 rs; ok") == \
+        ["hello world,", "how are you.", "i paid 1,000 rs;", "ok"]
+
+
+def test_stable_segments_are_not_retranslated():
+    log = []
+    inc = IncrementalTranslator(echo_backend(log))
+    replay(inc, "hello world, how are you.")
+    inc.finalize()
+    assert log.count(("hi", "hello world,")) == 1
+    assert inc.caption("hi") == "<hi:hello world,> <hi:how are you.>"
+
+
+def test_unpunctuated_ending_is_flushed():
+    inc = IncrementalTranslator(echo_backend([]))
+    utt = "I am going to Mumbai tomorrow to meet him"
+    captions = replay(inc, utt)
+    assert captions["hi"] != f"<hi:{utt}>"      # tail still held
+
+    for lang, diff in inc.finalize().items():
+        captions[lang] = apply_diff(captions[lang], diff)
+    assert captions["hi"] == inc.caption("hi") == f"<hi:{utt}>"
+    assert captions["te"] == f"<te:{utt}>"
+    assert inc.finalize() == {}
+
+
+def test_backend_errors_are_not_cached():
+    calls = []
+
+    def flaky(requests):
+        calls.append(requests)
+        if len(calls) == 1:
+            raise RuntimeError("offline")
+        return [text for _, text in requests]
+
+    inc = IncrementalTranslator(flaky, langs=("hi",))
+    inc.update("hello.")
+    assert inc.caption("hi") == "[Error: offline]"
+    inc.reset()
+    inc.update("hello.")
+    assert inc.caption("hi") == "hello."
+
+
+def test_live_chunks_extend_one_utterance():
+    # ContinuousSTT emits a chunk of text every ~2 s of audio; the second
+    # chunk must continue the utterance, not start a new one
+    log = []
+    shown = []
+    live = LiveCaptions(IncrementalTranslator(echo_backend(log), langs=("hi",)),
+                        show=shown.append)
+    live.on_text("I am going to Mumbai tomorrow,")
+    live.on_text("my brother lives there")
+    assert live.hypothesis == "I am going to Mumbai tomorrow, my brother lives there"
+    assert log.count(("hi", "I am going to Mumbai tomorrow,")) == 1
+    assert live.captions["hi"] == live.inc.caption("hi")
+
+    live.on_silence()       # empty chunk: utterance ends, tail flushed
+    assert shown[-1] == "[hi] <hi:I am going to Mumbai tomorrow,> <hi:my brother lives there>"
+    assert live.hypothesis == "" and live.inc.caption("hi") == ""
@@ -0,0 +1,30 @@
+import importlib
+
+import pytest
+
+pytest.importorskip("tqdm")
+
+
+def read(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_en_te_valid_test_are_held_out(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)     # merge_all creates ./data on import
+    merge_all = importlib.import_module("merge_all")
+    monkeypatch.setattr(merge_all, "OUT_DIR", str(tmp_path))
+    hi = ([f"h{i}" for i in range(6)], [f"H{i}" for i in range(6)])
+    dev = (["d0", "d1"], ["D0", "D1"])
+    test = (["t0"], ["T0"])
+    te = ([f"e{i}" for i in range(10)], [f"E{i}" for i in range(10)])
+
+    merge_all.merge_and_split(hi, dev, test, ([], []), te)
+
+    splits = {s: list(zip(read(tmp_path / f"{s}.en-te.en"), read(tmp_path / f"{s}.te")))
+              for s in ("train", "valid", "test")}
+    assert len(splits["valid"]) == 2 and len(splits["test"]) == 1
+    assert len(splits["train"]) == 7
+    # pairs stay aligned and no pair appears in two splits
+    everything = [p for rows in splits.values() for p in rows]
+    assert all(en[1:] == te_[1:] for en, te_ in everything)
+    assert sorted(everything) == sorted(zip(*te))
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from streaming_tts import DummyEngine, NullPlayer, StreamingTTS, split_phrases
+
+
+def test_split_phrases():
+    assert split_phrases("नमस्ते दुनिया। आप कैसे हैं? ok.") == \
+        ["नमस्ते दुनिया।", "आप कैसे हैं?", "ok."]
+    long = "a" * 50 + ", " + "b" * 50 + "."
+    assert split_phrases(long, max_chars=80) == ["a" * 50 + ",", "b" * 50 + "."]
+    assert split_phrases("।") == []
+    assert split_phrases("   ") == []
+
+
+def test_streaming_plays_every_phrase():
+    engine = DummyEngine(rtf=0)
+    player = NullPlayer(engine.sample_rate)
+    text = "नमस्ते दुनिया। आप कैसे हैं?"
+    stats = StreamingTTS(engine, player).speak(text)
+    assert stats["phrases"] == 2
+    assert stats["first_audio"] is not None
+    assert stats["first_audio"] <= stats["total"]
+    expected = sum(len(engine.synthesize(p)) for p in split_phrases(text))
+    assert player.samples_played == expected
+
+
+def test_nothing_to_play():
+    engine = DummyEngine(rtf=0)
+    stats = StreamingTTS(engine, NullPlayer(engine.sample_rate)).speak("")
+    assert stats["first_audio"] is None
+
+
+class FailsOn(DummyEngine):
+    def __init__(self, bad):
+        super().__init__(rtf=0)
+        self.bad = bad
+
+    def synthesize(self, text):
+        if text == self.bad:
+            raise RuntimeError("no voice")
+        return super().synthesize(text)
+
+
+def test_engine_error_on_first_phrase_is_raised():
+    engine = FailsOn("नमस्ते दुनिया।")
+    player = NullPlayer(engine.sample_rate)
+    with pytest.raises(RuntimeError, match="no voice"):
+        StreamingTTS(engine, player).speak("नमस्ते दुनिया।")
+    assert player.samples_played == 0
+
+
+def test_engine_error_on_later_phrase_is_raised_after_playback():
+    engine = FailsOn("आप कैसे हैं?")
+    player = NullPlayer(engine.sample_rate)
+    with pytest.raises(RuntimeError, match="no voice"):
+        StreamingTTS(engine, player).speak("नमस्ते दुनिया। आप कैसे हैं?")
+    assert player.samples_played == len(engine.synthesize("नमस्ते दुनिया।"))
+
+
+def test_speak_hindi_falls_back_to_gtts(monkeypatch):
+    for mod in ("speech_recognition", "translate", "gtts"):
+        pytest.importorskip(mod)
+    import speech_translate1
+
+    saved = []
+
+    class FakeGTTS:
+        def __init__(self, text, lang):
+            self.text = text
+
+        def save(self, filename):
+            saved.append(self.text)
+
+    monkeypatch.setattr(speech_translate1.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(speech_translate1, "_piper_hi", FailsOn("नमस्ते दुनिया।"))
+    monkeypatch.setattr(speech_translate1, "SoundDevicePlayer", NullPlayer)
+    monkeypatch.setattr(speech_translate1, "gTTS", FakeGTTS)
+    monkeypatch.setattr(speech_translate1.os, "system", lambda cmd: 0)
+
+    speech_translate1.speak_hindi("नमस्ते दुनिया।")
+    assert saved == ["नमस्ते दुनिया।"]
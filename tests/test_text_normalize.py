@@ -0,0 +1,30 @@
+from text_normalize import (BENCH_LINES, _old_clean_text, _old_normalize_text,
+                            normalize_text)
+
+BENCH = [line for lines in BENCH_LINES.values() for line in lines]
+
+EXTRA = [
+    "see http://x.org<br>next",
+    "<b>www.example.org</b> देखें",
+    "a b  ｆｕｌｌ\twidth\n",
+    "x < y and y > z",
+    "",
+]
+
+
+def test_matches_old_clean_text():
+    for line in BENCH + EXTRA:
+        assert normalize_text(line) == _old_clean_text(line), repr(line)
+
+
+def test_url_inside_tag_is_removed_with_the_tag():
+    # intended difference: the old URL-then-HTML passes left '<a href='
+    line = "<a href=http://x.org>link</a> text"
+    assert _old_clean_text(line) == "<a href= text"
+    assert normalize_text(line) == "link text"
+
+
+def test_matches_old_tokenizer_normalization_without_markup():
+    for line in BENCH + EXTRA:
+        if not any(m in line for m in ("<", "://", "www.")):
+            assert normalize_text(line) == _old_normalize_text(line), repr(line)
@@ -0,0 +1,54 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from vocab_shortlist import ShortlistGenerator
+
+VOCAB = 200
+PAD, EOS, UNK = VOCAB - 1, 0, 1     # pad is the last id, as in opus-mt
+
+
+class Ids:
+    pad_token_id = PAD
+    eos_token_id = EOS
+    unk_token_id = UNK
+
+
+def tiny_marian():
+    torch.manual_seed(0)
+    cfg = transformers.MarianConfig(
+        vocab_size=VOCAB, decoder_vocab_size=VOCAB, d_model=32,
+        encoder_layers=1, decoder_layers=1, encoder_attention_heads=2,
+        decoder_attention_heads=2, encoder_ffn_dim=64, decoder_ffn_dim=64,
+        pad_token_id=PAD, eos_token_id=EOS, decoder_start_token_id=PAD,
+        forced_eos_token_id=EOS, max_position_embeddings=64,
+    )
+    return transformers.MarianMTModel(cfg).eval()
+
+
+def batch():
+    ids = torch.tensor([[5, 17, 42, 8, EOS], [9, 3, EOS, PAD, PAD]])
+    return {"input_ids": ids, "attention_mask": (ids != PAD).long()}
+
+
+def test_full_shortlist_matches_plain_generate():
+    model = tiny_marian()
+    gen = ShortlistGenerator(model, Ids(), range(VOCAB))
+    with torch.no_grad():
+        expected = model.generate(**batch(), max_length=12, num_beams=2)
+        got = gen.generate(batch(), max_length=12, num_beams=2)
+    assert torch.equal(got, expected)
+
+
+def test_small_shortlist_decodes_within_shortlist():
+    model = tiny_marian()
+    base = list(range(2, 40))
+    gen = ShortlistGenerator(model, Ids(), base, lexical={"17": [150]})
+    with torch.no_grad():
+        out = gen.generate(batch(), max_length=12, num_beams=2)
+    allowed = set(base) | {PAD, EOS, UNK, 150}
+    assert set(out.flatten().tolist()) <= allowed
+    # full-vocab modules are restored afterwards
+    assert model.lm_head.out_features == VOCAB
+    assert model.get_decoder().embed_tokens.num_embeddings == VOCAB
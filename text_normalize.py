@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+text_normalize.py
+
+Shared text normalization for corpus building (merge_all.py), tokenizer
+training (train_tokenizer.py) and the live pipeline, so that all three
+produce identical strings (cache keys, tokenizer input).
+
+normalize_text():
+  - NFKC (skipped for pure-ASCII lines, which NFKC never changes)
+  - URLs and HTML tags removed in a single regex pass (skipped when the
+    line cannot contain either)
+  - whitespace collapsed to single spaces, ends stripped
+
+Compared with the old per-script functions:
+  - vs merge_all.clean_text: same output except for URLs inside a tag.
+    The old URL-then-HTML passes turned '<a href=http://x.org>link</a>
+    text' into '<a href= text'; the single pass gives 'link text'.
+  - vs train_tokenizer.normalize_text: same output on markup-free lines,
+    but that function never stripped URLs / HTML. The markup gate (three
+    `in` scans, ~0.1 us) makes markup-free non-ASCII lines about 10%
+    slower than it was. A precompiled regex search as the gate measured
+    ~3x slower than the scans, and unicodedata.is_normalized gains
+    nothing because normalize() already runs the same quick check.
+
+Usage:
+  python3 text_normalize.py --bench     # lines/sec vs the old functions
+"""
+
+import re
+import time
+import argparse
+import unicodedata
+
+URL_HTML_RE = re.compile(r'https?://\S+|www\.\S+|<[^>]+>')
+
+
+def normalize_text(s: str) -> str:
+    if not s.isascii():
+        s = unicodedata.normalize("NFKC", s)
+    if "<" in s or "://" in s or "www." in s:
+        s = URL_HTML_RE.sub("", s)
+    return " ".join(s.split())
+
+# ----------------------------------------------------------------------
+# Micro-benchmark against the previous per-script implementations
+# ----------------------------------------------------------------------
+
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+_HTML_RE = re.compile(r'<[^>]+>')
+_MULTISPACE_RE = re.compile(r'\s+')
+
+def _old_clean_text(text):
+    # merge_all.clean_text before the shared module
+    text = text.strip()
+    text = unicodedata.normalize("NFKC", text)
+    text = _URL_RE.sub("", text)
+    text = _HTML_RE.sub("", text)
+    text = _MULTISPACE_RE.sub(" ", text)
+    return text.strip()
+
+def _old_normalize_text(s):
+    # train_tokenizer.normalize_text before the shared module
+    s = s.strip()
+    s = unicodedata.normalize("NFKC", s)
+    s = " ".join(s.split())
+    return s
+
+BENCH_LINES = {
+    "english": [
+        "The quick brown fox jumps over the lazy dog.\n",
+        "  I am going to Mumbai tomorrow,   my brother lives there. \n",
+        "Visit https://example.org/page for <b>more</b> details.\n",
+    ],
+    "devanagari": [
+        "मैं कल मुंबई जा रहा हूँ, मेरा भाई वहाँ रहता है।\n",
+        "  नमस्ते   दुनिया, आप कैसे हैं?  \n",
+        "अधिक जानकारी के लिए <a>www.example.org</a> देखें।\n",
+    ],
+    "telugu": [
+        "నేను రేపు ముంబైకి వెళ్తాను, నా సోదరుడు అక్కడ ఉంటాడు.\n",
+        "  హలో   వరల్డ్, మీరు ఎలా ఉన్నారు?  \n",
+        "మరిన్ని వివరాలకు https://example.org చూడండి.\n",
+    ],
+}
+
+def _lines_per_sec(fn, lines, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for ln in lines:
+            fn(ln)
+    return repeat * len(lines) / (time.perf_counter() - t0)
+
+def bench(repeat=50000):
+    funcs = [
+        ("merge_all.clean_text (old)", _old_clean_text),
+        ("train_tokenizer.normalize_text (old)", _old_normalize_text),
+        ("text_normalize.normalize_text", normalize_text),
+    ]
+    # markup lines reported apart: the old tokenizer function skipped
+    # URL / HTML removal, so only the plain lines compare like for like
+    for script, lines in BENCH_LINES.items():
+        plain = [ln for ln in lines if not URL_HTML_RE.search(ln)]
+        markup = [ln for ln in lines if URL_HTML_RE.search(ln)]
+        for kind, subset in (("plain", plain), ("URL / HTML", markup)):
+            print(f"\n{script}, {kind} ({len(subset) * repeat} lines)")
+            for name, fn in funcs:
+                print(f"  {name:38s} {_lines_per_sec(fn, subset, repeat):12,.0f} lines/sec")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true",
+                        help="Run the normalization micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=50000)
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.repeat)
+    else:
+        parser.print_help()
@@ -21,19 +21,12 @@ Usage:
 import os
 import argparse
 import random
-import unicodedata
 import sentencepiece as spm
+from text_normalize import normalize_text
 
 # -------------------------
 # Helpers
 # -------------------------
-def normalize_text(s: str) -> str:
-    # basic unicode normalization + collapse whitespace
-    s = s.strip()
-    s = unicodedata.normalize("NFKC", s)
-    s = " ".join(s.split())
-    return s
-
 def cat_and_prepare(input_files, out_path, shuffle=True, max_lines=None):
     lines = []
     for f in input_files:
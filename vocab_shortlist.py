@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+vocab_shortlist.py
+
+Target-vocabulary shortlist decoding for the en->hi / en->te Marian models.
+
+Most of the output vocabulary can never appear in Devanagari or Telugu
+output, yet the full softmax is computed at every decode step. This script
+builds a per-language shortlist offline and decodes with the output
+projection (and decoder embeddings) restricted to it:
+
+  base      target-side tokens covering --coverage of data/train.{lang},
+            plus vocab entries written entirely in the target script
+  lexical   optional source-conditioned candidates: for each English token,
+            the rarer target tokens that co-occur with it most (Dice score
+            over aligned sentence pairs), added per batch at decode time
+
+Outputs:
+  shortlists/hi.json
+  shortlists/te.json
+
+Usage:
+  python3 vocab_shortlist.py build --lang hi
+  python3 vocab_shortlist.py evaluate --lang hi --max_lines 1000
+"""
+
+import os
+import copy
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from marian_translate import MODELS, MAX_LEN, NUM_BEAMS
+from corpus_files import SRC_FILES, read_batches, read_lines
+
+DATA_DIR = "data"
+OUT_DIR = "shortlists"
+
+SCRIPT_RANGES = {
+    "hi": (0x0900, 0x097F),     # Devanagari
+    "te": (0x0C00, 0x0C7F),     # Telugu
+}
+
+# ----------------------------------------------------------------------
+# Building
+# ----------------------------------------------------------------------
+
+def script_vocab_ids(tokenizer, lang):
+    """Vocab entries whose characters are all in the target script."""
+    lo, hi = SCRIPT_RANGES[lang]
+    ids = []
+    for piece, idx in tokenizer.get_vocab().items():
+        chars = piece.replace("▁", "")
+        if chars and all(lo <= ord(c) <= hi for c in chars):
+            ids.append(idx)
+    return ids
+
+def frequent_target_ids(tokenizer, path, coverage, max_lines):
+    counts = Counter()
+    for batch in read_batches(path, max_lines):
+        for ids in tokenizer(text_target=batch, add_special_tokens=False)["input_ids"]:
+            counts.update(ids)
+
+    total = sum(counts.values())
+    keep, seen = [], 0
+    for idx, c in counts.most_common():
+        if seen >= coverage * total:
+            break
+        keep.append(idx)
+        seen += c
+    return keep, total
+
+def lexical_candidates(tokenizer, src_path, tgt_path, base, max_lines,
+                       top_k=10, min_count=2):
+    """Per-source-token target candidates that are not already in `base`."""
+    pair, src_count, tgt_count = Counter(), Counter(), Counter()
+    for src_batch, tgt_batch in zip(read_batches(src_path, max_lines),
+                                    read_batches(tgt_path, max_lines)):
+        src_ids = tokenizer(src_batch, add_special_tokens=False)["input_ids"]
+        tgt_ids = tokenizer(text_target=tgt_batch, add_special_tokens=False)["input_ids"]
+        for s, t in zip(src_ids, tgt_ids):
+            s = set(s)
+            rare = set(t) - base
+            src_count.update(s)
+            tgt_count.update(rare)
+            for a in s:
+                for b in rare:
+                    pair[(a, b)] += 1
+
+    scored = defaultdict(list)
+    for (a, b), c in pair.items():
+        if c >= min_count:
+            scored[a].append((2 * c / (src_count[a] + tgt_count[b]), b))
+    return {str(a): [b for _, b in sorted(cands, reverse=True)[:top_k]]
+            for a, cands in scored.items()}
+
+def build(args):
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    tgt_path = os.path.join(args.data_dir, f"train.{args.lang}")
+    max_lines = args.max_lines or None
+
+    print("Counting target tokens in", tgt_path)
+    freq, total = frequent_target_ids(tokenizer, tgt_path, args.coverage, max_lines)
+    base = set(freq)
+    print(f"  {len(freq)} tokens cover {args.coverage:.4%} of {total} target tokens")
+
+    if args.script_vocab:
+        script = script_vocab_ids(tokenizer, args.lang)
+        base.update(script)
+        print(f"  + {len(script)} vocab entries in target script")
+
+    base.update(i for i in (tokenizer.pad_token_id, tokenizer.eos_token_id,
+                            tokenizer.unk_token_id) if i is not None)
+
+    lexical = {}
+    if args.lexical:
+        src_path = os.path.join(args.data_dir, SRC_FILES[args.lang].format(split="train"))
+        print("Building source-conditioned candidates from", src_path)
+        lexical = lexical_candidates(tokenizer, src_path, tgt_path, base, max_lines,
+                                     top_k=args.top_k)
+        print(f"  candidates for {len(lexical)} source tokens")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    out_path = os.path.join(args.out_dir, f"{args.lang}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"model": args.model, "vocab_size": len(tokenizer),
+                   "base": sorted(base), "lexical": lexical}, f)
+    print(f"Shortlist ({len(base)} / {len(tokenizer)} tokens) saved to: {out_path}")
+
+# ----------------------------------------------------------------------
+# Restricted decoding
+# ----------------------------------------------------------------------
+
+class ShortlistGenerator:
+    """
+    Runs model.generate() with the decoder embeddings, output projection
+    and final_logits_bias restricted to a shortlist, so decoding happens in
+    shortlist index space; outputs are mapped back to full vocab ids.
+    """
+
+    def __init__(self, model, tokenizer, base_ids, lexical=None):
+        cfg = model.generation_config
+        special = {tokenizer.pad_token_id, tokenizer.eos_token_id,
+                   tokenizer.unk_token_id, cfg.decoder_start_token_id}
+        self.model = model
+        self.tokenizer = tokenizer
+        self.base = set(base_ids) | {i for i in special if i is not None}
+        self.lexical = {int(k): v for k, v in (lexical or {}).items()}
+        self._cached = None
+
+    @classmethod
+    def load(cls, model, tokenizer, path, use_lexical=True):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(model, tokenizer, data["base"], data["lexical"] if use_lexical else None)
+
+    def vocab_for(self, input_ids):
+        ids = set(self.base)
+        if self.lexical:
+            for i in set(input_ids.flatten().tolist()):
+                ids.update(self.lexical.get(i, ()))
+        return sorted(ids)
+
+    def _restricted_modules(self, vocab):
+        import torch
+        from torch import nn
+
+        if self._cached and self._cached[0] == vocab:
+            return self._cached[1]
+
+        model = self.model
+        old_embed = model.get_decoder().embed_tokens
+        old_head = model.lm_head
+        idx = torch.tensor(vocab, device=old_head.weight.device)
+
+        with torch.no_grad():
+            head_w = old_head.weight[idx]
+            embed_w = head_w if old_embed.weight is old_head.weight else old_embed.weight[idx]
+
+            # shallow copy keeps any embedding scale the decoder class uses
+            embed = copy.copy(old_embed)
+            embed._parameters = dict(old_embed._parameters)
+            embed.weight = nn.Parameter(embed_w, requires_grad=False)
+            embed.num_embeddings = len(vocab)
+            # padding_idx must point into the shortlist, not the full vocab
+            if old_embed.padding_idx is not None:
+                embed.padding_idx = vocab.index(old_embed.padding_idx)
+
+            head = nn.Linear(head_w.shape[1], len(vocab), bias=False)
+            head.weight = nn.Parameter(head_w, requires_grad=False)
+
+            bias = model.final_logits_bias[:, idx]
+
+        modules = (idx, embed, head, bias)
+        self._cached = (vocab, modules)
+        return modules
+
+    @contextmanager
+    def restricted(self, vocab):
+        model = self.model
+        decoder = model.get_decoder()
+        saved = (decoder.embed_tokens, model.lm_head, model.final_logits_bias)
+        idx, embed, head, bias = self._restricted_modules(vocab)
+        decoder.embed_tokens, model.lm_head, model.final_logits_bias = embed, head, bias
+        try:
+            yield idx
+        finally:
+            decoder.embed_tokens, model.lm_head, model.final_logits_bias = saved
+
+    def generate(self, batch, **kwargs):
+        vocab = self.vocab_for(batch["input_ids"])
+        remap = {full: i for i, full in enumerate(vocab)}
+        cfg = self.model.generation_config
+        pad, eos = self.tokenizer.pad_token_id, self.tokenizer.eos_token_id
+
+        with self.restricted(vocab) as idx:
+            out = self.model.generate(
+                **batch,
+                decoder_start_token_id=remap[cfg.decoder_start_token_id],
+                pad_token_id=remap[pad],
+                eos_token_id=remap[eos],
+                forced_eos_token_id=remap[eos],
+                bad_words_ids=[[remap[pad]]],
+                **kwargs,
+            )
+        return idx[out]
+
+# ----------------------------------------------------------------------
+# Evaluation on the validation split
+# ----------------------------------------------------------------------
+
+def evaluate_split(args):
+    import torch
+    import evaluate
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForSeq2SeqLM.from_pretrained(args.model).to(args.device).eval()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    src = read_lines(os.path.join(args.data_dir, SRC_FILES[args.lang].format(split="valid")),
+                     args.max_lines)
+    refs = read_lines(os.path.join(args.data_dir, f"valid.{args.lang}"), args.max_lines)
+    n = min(len(src), len(refs))
+    src, refs = src[:n], refs[:n]
+    bleu = evaluate.load("sacrebleu")      # same metric as distill.py / Training.ipynb
+
+    path = os.path.join(args.out_dir, f"{args.lang}.json")
+    setups = [("full vocab", None)]
+    setups.append(("shortlist", ShortlistGenerator.load(model, tokenizer, path, use_lexical=False)))
+    setups.append(("shortlist + lexical", ShortlistGenerator.load(model, tokenizer, path)))
+
+    print(f"\nen->{args.lang}, {n} validation sentences, batch {args.batch_size}, "
+          f"full vocab {len(tokenizer)}")
+    def translate(gen, texts):
+        batch = tokenizer(texts, return_tensors="pt", padding=True,
+                          truncation=True, max_length=MAX_LEN).to(args.device)
+        with torch.no_grad():
+            if gen is None:
+                out = model.generate(**batch, max_length=MAX_LEN, num_beams=args.num_beams)
+            else:
+                out = gen.generate(batch, max_length=MAX_LEN, num_beams=args.num_beams)
+        return batch["input_ids"], tokenizer.batch_decode(out, skip_special_tokens=True)
+
+    baseline = None
+    for label, gen in setups:
+        # untimed warm-up, so the first setup does not pay one-time costs
+        translate(gen, src[:args.batch_size])
+        preds, inputs = [], []
+        t0 = time.perf_counter()
+        for i in range(0, n, args.batch_size):
+            ids, out = translate(gen, src[i:i + args.batch_size])
+            inputs.append(ids)
+            preds.extend(t.strip() for t in out)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        score = bleu.compute(predictions=preds, references=[[r] for r in refs])["score"]
+        # lexical entries make the shortlist differ per batch: mean size
+        size = (sum(len(gen.vocab_for(ids)) for ids in inputs) / len(inputs)
+                if gen else len(tokenizer))
+        print(f"  {label:20s} |V|={size:8.1f}  {n / elapsed:7.2f} sent/s  "
+              f"speedup x{baseline / elapsed:5.2f}  BLEU {score:6.2f}")
+
+# ----------------------------------------------------------------------
+# MAIN
+# ----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="Build a shortlist from the training data")
+    p.add_argument("--lang", choices=sorted(MODELS), required=True)
+    p.add_argument("--data_dir", type=str, default=DATA_DIR)
+    p.add_argument("--out_dir", type=str, default=OUT_DIR)
+    p.add_argument("--coverage", type=float, default=0.9995,
+                   help="Fraction of target tokens the frequency shortlist must cover")
+    p.add_argument("--script_vocab", type=lambda x: (str(x).lower() in ("true","1","yes")), default=True,
+                   help="Also include vocab entries written in the target script")
+    p.add_argument("--lexical", type=lambda x: (str(x).lower() in ("true","1","yes")), default=True,
+                   help="Build source-conditioned candidates")
+    p.add_argument("--top_k", type=int, default=10)
+    p.add_argument("--max_lines", type=int, default=500000,
+                   help="Max corpus lines to scan (0 = unlimited)")
+    p.set_defaults(func=build)
+
+    p = sub.add_parser("evaluate", help="Speed / BLEU on the validation split")
+    p.add_argument("--lang", choices=sorted(MODELS), required=True)
+    p.add_argument("--data_dir", type=str, default=DATA_DIR)
+    p.add_argument("--out_dir", type=str, default=OUT_DIR)
+    p.add_argument("--max_lines", type=int, default=1000)
+    p.add_argument("--batch_size", type=int, default=16)
+    p.add_argument("--num_beams", type=int, default=NUM_BEAMS)
+    p.add_argument("--device", type=str, default="cpu")
+    p.add_argument("--threads", type=int, default=0)
+    p.set_defaults(func=evaluate_split)
+
+    for p in sub.choices.values():
+        p.add_argument("--model", type=str, default=None,
+                       help="Model dir/name (default: opus-mt for --lang)")
+
+    args = parser.parse_args()
+    args.model = args.model or MODELS[args.lang]
+    args.func(args)
+
+if __name__ == "__main__":
+    main()